@@ -1,64 +1,176 @@
 #!/usr/bin/env python3
 """
 Script to fetch soccer odds from the Sports Game Odds API.
-Uses pagination with cursor to retrieve all results.
+Uses pagination with cursor to retrieve all results, fetching
+day-sized date windows concurrently.
 """
 
-import requests
-import json
-import sys
-import yaml
+import argparse
+import io
+import logging
+import orjson
 import os
+import re
+import shutil
+import sys
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+from src.utils.config import load_yaml
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Keep the pooled session's per-connection chatter out of the output
+logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
+
+# (connect, read) timeouts in seconds for SportsGameOdds requests
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Local response cache so repeated runs don't burn API quota.
+# Sport lists rarely change, but event odds move quickly.
+CACHE_NAME = "sgo_cache"
+CACHE_EXPIRE_AFTER = timedelta(minutes=5)
+CACHE_URLS_EXPIRE_AFTER = {
+    "api.sportsgameodds.com/v2/sports*": timedelta(days=1),
+    "api.sportsgameodds.com/v2/events*": timedelta(minutes=2),
+}
+
+# Directory receiving the decoded body of every events page as fetched; it is
+# emptied at the start of each run and supersedes soccer_events_raw.json
+RAW_PAGES_DIR = "soccer_events_raw"
+
+# Number of events shown in each on-screen summary
+SUMMARY_EVENTS = 5
+
+# Market types that look like spreads: explicit spread/handicap markets,
+# home/away plus/minus lines, and points over/under/handicap markets
+SPREAD_MARKET_RE = re.compile(
+    r"spread|handicap"
+    r"|^(?=.*(?:home|away))(?=.*(?:plus|minus))"
+    r"|^(?=.*points)(?=.*(?:ou|over|under|hdp))",
+    re.IGNORECASE
+)
 
 def load_config(config_path="config.yaml"):
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file (re-parsed only when the file changes)."""
     if not os.path.exists(config_path):
         print(f"Config file not found: {config_path}")
         return None
     
-    with open(config_path, 'r') as file:
-        config = yaml.safe_load(file)
-    
-    return config
+    return load_yaml(config_path)
 
-def fetch_soccer_events_with_odds(api_key, league=None):
+def _index_sportsbooks(config):
     """
-    Fetch soccer events with their odds using pagination.
+    Index the configured sportsbooks by name.
     
     Args:
-        api_key (str): API key for SportsGameOdds
-        league (str, optional): Specific soccer league ID
+        config (dict): Parsed configuration
     
     Returns:
-        list: List of events with odds
+        dict: Sportsbook config sections keyed by their name
     """
-    url = "https://api.sportsgameodds.com/v2/events"
-    headers = {
-        "X-API-Key": api_key
+    return {
+        sportsbook.get('name'): sportsbook
+        for sportsbook in config.get('apis', {}).get('sportsbooks', [])
     }
+
+class JsonArrayWriter:
+    """
+    Write a JSON array to a file one item at a time.
     
-    # Base parameters
-    params = {
-        "limit": 100,  # Max allowed limit to reduce number of API calls
-    }
+    Each item is encoded with orjson and written immediately, so the full
+    array is never held in memory as a single JSON document. Items are
+    written compactly, one per line, unless pretty output is requested.
+    """
     
-    # Add sport or league filter
-    if league:
-        params["leagueID"] = league
-    else:
-        params["sportID"] = "SOCCER"
+    def __init__(self, path, pretty=False):
+        """
+        Open the output file and start the array.
+        
+        Args:
+            path (str): Path of the JSON file to write
+            pretty (bool, optional): Indent each item instead of writing it on one line
+        """
+        self.path = path
+        self.count = 0
+        self.option = orjson.OPT_INDENT_2 if pretty else None
+        self.file = open(path, "wb")
+        self.file.write(b"[")
+    
+    def write(self, item):
+        """
+        Append an item to the array.
+        
+        Args:
+            item: JSON-serializable object
+        """
+        self.file.write(b",\n" if self.count else b"\n")
+        self.file.write(orjson.dumps(item, option=self.option))
+        self.count += 1
+    
+    def close(self):
+        """Finish the array and close the file."""
+        self.file.write(b"\n]" if self.count else b"]")
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def create_session(api_key):
+    """
+    Create a pooled, disk-cached HTTP session for the SportsGameOdds API.
     
-    # Add date range for upcoming events
-    today = datetime.now()
-    next_week = today + timedelta(days=7)
-    params["startsAfter"] = today.strftime("%Y-%m-%d")
-    params["startsBefore"] = next_week.strftime("%Y-%m-%d")
+    Args:
+        api_key (str): API key for SportsGameOdds
+    
+    Returns:
+        requests_cache.CachedSession: Session with the API key header, keep-alive
+        pooling and a SQLite response cache
+    """
+    session = CachedSession(
+        CACHE_NAME,
+        backend="sqlite",
+        expire_after=CACHE_EXPIRE_AFTER,
+        urls_expire_after=CACHE_URLS_EXPIRE_AFTER,
+        allowable_methods=["GET"],
+        stale_if_error=True
+    )
+    # requests already advertises gzip/deflate, and adds br when brotli is installed
+    session.headers.update({"X-API-Key": api_key})
+    
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retry))
+    
+    return session
+
+def fetch_events_window(session, params, label="", raw_dir=None):
+    """
+    Fetch every page of events for a single query window using the cursor.
     
-    print(f"Fetching soccer events from {params['startsAfter']} to {params['startsBefore']}...")
+    Args:
+        session (requests.Session): Session created by create_session
+        params (dict): Query parameters for the window (copied, not modified)
+        label (str, optional): Prefix for progress messages
+        raw_dir (str, optional): Directory to save each page's response body in
+    
+    Returns:
+        list: List of events in the window
+    """
+    url = "https://api.sportsgameodds.com/v2/events"
+    params = dict(params)
     
     # Use pagination with cursor to get all results
-    all_events = []
+    window_events = []
     next_cursor = None
     page = 1
     
@@ -67,292 +179,383 @@ def fetch_soccer_events_with_odds(api_key, league=None):
             params["cursor"] = next_cursor
         
         try:
-            print(f"Fetching page {page} of events...")
-            response = requests.get(url, headers=headers, params=params)
+            logger.info("%sFetching page %d of events...", label, page)
+            response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             
             if response.status_code != 200:
-                print(f"Error: {response.status_code} - {response.text}")
+                logger.error("%sError: %s - %s", label, response.status_code, response.text)
                 break
             
-            data = response.json()
+            # The cached session always buffers the whole body, so parse it in one pass
+            body = response.content
+            
+            if raw_dir:
+                # Save the body exactly as received
+                filter_id = params.get("leagueID") or params.get("sportID")
+                raw_path = os.path.join(raw_dir, f"{filter_id}_{params['startsAfter']}_page{page}.json")
+                with open(raw_path, "wb") as raw_file:
+                    raw_file.write(body)
+            
+            data = orjson.loads(body)
             
             if not data.get("success", False):
-                print(f"API returned failure: {data}")
+                logger.error("%sAPI returned failure: %s", label, data)
                 break
             
             events = data.get("data", [])
-            print(f"Retrieved {len(events)} events on page {page}")
+            logger.info("%sRetrieved %d events on page %d", label, len(events), page)
             
             if not events:
-                print("No events found in response")
                 break
             
-            all_events.extend(events)
+            window_events.extend(events)
             
             # Check if there are more pages
             next_cursor = data.get("nextCursor")
             if not next_cursor:
-                print("Reached the end of results")
                 break
             
             page += 1
             
         except Exception as e:
-            print(f"Error fetching events: {str(e)}")
+            logger.error("%sError fetching events: %s", label, e)
             break
     
-    print(f"Total events retrieved: {len(all_events)}")
-    return all_events
+    return window_events
 
-def process_and_save_events(events):
+def fetch_soccer_events_with_odds(session, league=None, days=7, max_workers=8, raw_dir=None):
     """
-    Process events and save to file.
+    Fetch soccer events with their odds using pagination.
+    
+    The date range is split into one-day windows which are fetched
+    concurrently; each window still follows its own cursor serially.
     
     Args:
-        events (list): List of events with odds
+        session (requests.Session): Session created by create_session
+        league (str, optional): Specific soccer league ID
+        days (int, optional): Number of days ahead to fetch
+        max_workers (int, optional): Maximum number of windows fetched at once
+        raw_dir (str, optional): Directory to save each page's response body in
     
     Returns:
-        list: Processed events with odds in a format suitable for analysis
+        list: List of events with odds
     """
-    if not events:
-        print("No events to process")
-        return []
+    # Base parameters
+    params = {
+        "limit": 100,  # Max allowed limit to reduce number of API calls
+    }
+    
+    # Add sport or league filter
+    if league:
+        params["leagueID"] = league
+    else:
+        params["sportID"] = "SOCCER"
     
-    # Save raw events data
-    with open("soccer_events_raw.json", "w") as f:
-        json.dump(events, f, indent=2)
-    print("Raw events saved to soccer_events_raw.json")
+    # Split the upcoming date range into day buckets
+    today = datetime.now()
+    windows = []
+    for offset in range(days):
+        window_params = dict(params)
+        window_params["startsAfter"] = (today + timedelta(days=offset)).strftime("%Y-%m-%d")
+        window_params["startsBefore"] = (today + timedelta(days=offset + 1)).strftime("%Y-%m-%d")
+        windows.append(window_params)
     
-    # Process events to extract relevant information
-    processed_events = []
+    logger.info("Fetching soccer events from %s to %s in %d windows...",
+                windows[0]['startsAfter'], windows[-1]['startsBefore'], len(windows))
     
-    for event in events:
-        # Print the first event structure to debug
-        if len(processed_events) == 0:
-            print("\nExample event structure:")
-            print(json.dumps({k: "..." for k in event.keys()}, indent=2))
-            
-            # If we have home/away teams, show their structure
-            if 'home' in event:
-                print("\nHome team structure:")
-                print(json.dumps(event['home'], indent=2))
-            if 'away' in event:
-                print("\nAway team structure:")
-                print(json.dumps(event['away'], indent=2))
-        
-        # Try different methods to extract team names
-        home_team = "Unknown"
-        away_team = "Unknown"
-        
-        # Try different structures to get team names
-        if 'home' in event and isinstance(event['home'], dict):
-            if 'names' in event['home'] and isinstance(event['home']['names'], dict):
-                home_team = event['home']['names'].get('long') or event['home']['names'].get('medium') or event['home']['names'].get('short', 'Unknown')
-            elif 'name' in event['home']:
-                home_team = event['home']['name']
-            elif 'teamID' in event['home']:
-                home_team = event['home']['teamID']
-                
-        if 'away' in event and isinstance(event['away'], dict):
-            if 'names' in event['away'] and isinstance(event['away']['names'], dict):
-                away_team = event['away']['names'].get('long') or event['away']['names'].get('medium') or event['away']['names'].get('short', 'Unknown')
-            elif 'name' in event['away']:
-                away_team = event['away']['name']
-            elif 'teamID' in event['away']:
-                away_team = event['away']['teamID']
-                
-        # Alternative method: look for teamID directly in event
-        if home_team == "Unknown" and 'homeTeamID' in event:
-            home_team = event['homeTeamID']
-        if away_team == "Unknown" and 'awayTeamID' in event:
-            away_team = event['awayTeamID']
-            
-        # Create processed event object
-        processed_event = {
-            'id': event.get('id'),
-            'homeTeam': home_team,
-            'awayTeam': away_team,
-            'startTime': event.get('startTime'),
-            'league': event.get('leagueID', 'Unknown'),
-            'markets': []
-        }
-        
-        # Extract odds information
-        odds = event.get('odds', {})
-        for odd_id, odd_data in odds.items():
-            # For this example, we're simplifying by focusing on basic odds
-            market_name = odd_data.get('name', 'Unknown')
-            
-            # Try to make a more descriptive name if it's unknown
-            if market_name == 'Unknown' and '-' in odd_id:
-                # Extract information from the odd_id itself
-                parts = odd_id.split('-')
-                if len(parts) >= 3:
-                    market_type = parts[0]  # e.g., "points"
-                    team_side = parts[1]    # e.g., "home", "away", "all"
-                    time_period = parts[2]  # e.g., "reg" (regulation time)
-                    market_name = f"{market_type.capitalize()} {team_side} {time_period}"
-            
-            processed_market = {
-                'type': odd_id,
-                'name': market_name,
-                'odds': odd_data.get('odds')
-            }
-            
-            processed_event['markets'].append(processed_market)
+    if raw_dir:
+        os.makedirs(raw_dir, exist_ok=True)
+    
+    # Fetch windows concurrently; the session's pool is shared by all workers
+    all_events = []
+    seen_ids = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(fetch_events_window, session, window_params, f"[{window_params['startsAfter']}] ", raw_dir)
+            for window_params in windows
+        ]
         
-        processed_events.append(processed_event)
+        # Merge in submission order so the output is ordered by day on every run
+        for future in futures:
+            for event in future.result():
+                # Windows may overlap at their boundaries, so dedupe by event ID
+                event_id = event.get('eventID') or event.get('id')
+                if event_id is not None:
+                    if event_id in seen_ids:
+                        continue
+                    seen_ids.add(event_id)
+                all_events.append(event)
+    
+    logger.info("Total events retrieved: %d", len(all_events))
+    if raw_dir:
+        logger.info("Raw event pages saved to %s/", raw_dir)
+    return all_events
+
+def _team_name(event, side):
+    """
+    Extract a team name for one side of an event.
     
-    # Save processed events
-    with open("soccer_events_processed.json", "w") as f:
-        json.dump(processed_events, f, indent=2)
-    print("Processed events saved to soccer_events_processed.json")
+    Tries the nested team names (long, medium, short), then the team's name
+    or teamID, and finally the event-level homeTeamID/awayTeamID field.
+    
+    Args:
+        event (dict): Raw event from the API
+        side (str): 'home' or 'away'
     
-    return processed_events
+    Returns:
+        str: Team name, or 'Unknown' if none is available
+    """
+    team_name = "Unknown"
+    
+    team = event.get(side)
+    if isinstance(team, dict):
+        names = team.get('names')
+        if isinstance(names, dict):
+            team_name = names.get('long') or names.get('medium') or names.get('short', 'Unknown')
+        elif 'name' in team:
+            team_name = team['name']
+        elif 'teamID' in team:
+            team_name = team['teamID']
+    
+    # Alternative method: look for teamID directly in event
+    if team_name == "Unknown":
+        team_name = event.get(f'{side}TeamID', team_name)
+    
+    return team_name
 
-def extract_spread_markets(events):
+def process_events(events, verbose=False, pretty=False,
+                   processed_path="soccer_events_processed.json",
+                   spread_path="soccer_spread_markets.json"):
     """
-    Extract spread markets from events for use in the Kalshi Odds Comparison tool.
+    Process events, extract their spread markets and save both to file.
+    
+    Each event is processed and checked for spread markets in a single pass,
+    and the processed and spread-market outputs are written as it goes. Only
+    the first SUMMARY_EVENTS of each are kept for the on-screen summary. The
+    raw responses are saved by fetch_soccer_events_with_odds as they arrive.
     
     Args:
-        events (list): List of processed events
-        
+        events (list): List of events with odds
+        verbose (bool, optional): Print the structure of the first event
+        pretty (bool, optional): Indent the JSON output files
+        processed_path (str, optional): Output file for the processed events
+        spread_path (str, optional): Output file for events with spread markets
+    
+    Returns:
+        tuple: (first processed events, number of processed events,
+                first events with only spread markets, number of such events)
+    """
+    if not events:
+        print("No events to process")
+        return [], 0, [], 0
+    
+    # Print the first event structure to debug, outside the processing loop
+    if verbose:
+        _print_event_structure(events[0])
+    
+    processed_preview = []
+    spread_preview = []
+    processed_count = 0
+    spread_count = 0
+    
+    with JsonArrayWriter(processed_path, pretty) as processed_writer, \
+            JsonArrayWriter(spread_path, pretty) as spread_writer:
+        for event in events:
+            processed_event, spread_markets = _process_event(event)
+            processed_writer.write(processed_event)
+            if processed_count < SUMMARY_EVENTS:
+                processed_preview.append(processed_event)
+            processed_count += 1
+            
+            # If we found spread markets, add this event for the Kalshi Odds Comparison tool
+            if spread_markets:
+                spread_event = dict(processed_event, markets=spread_markets)
+                spread_writer.write(spread_event)
+                if spread_count < SUMMARY_EVENTS:
+                    spread_preview.append(spread_event)
+                spread_count += 1
+    
+    print(f"Processed events saved to {processed_path}")
+    print(f"Found {spread_count} events with spread markets")
+    print(f"Spread markets saved to {spread_path}")
+    
+    return processed_preview, processed_count, spread_preview, spread_count
+
+def _print_event_structure(event):
+    """
+    Print the structure of a raw event to help debug the API format.
+    
+    Args:
+        event (dict): Raw event from the API
+    """
+    print("\nExample event structure:")
+    print(orjson.dumps({k: "..." for k in event.keys()}, option=orjson.OPT_INDENT_2).decode())
+    
+    # If we have home/away teams, show their structure
+    if 'home' in event:
+        print("\nHome team structure:")
+        print(orjson.dumps(event['home'], option=orjson.OPT_INDENT_2).decode())
+    if 'away' in event:
+        print("\nAway team structure:")
+        print(orjson.dumps(event['away'], option=orjson.OPT_INDENT_2).decode())
+
+def _process_event(event):
+    """
+    Convert a raw event into the processed format.
+    
+    Args:
+        event (dict): Raw event from the API
+    
     Returns:
-        list: Events with only spread markets
+        tuple: (processed event with all its markets, list of its spread markets)
     """
-    events_with_spreads = []
+    home_team = _team_name(event, 'home')
+    away_team = _team_name(event, 'away')
+    
+    # Create processed event object
+    processed_event = {
+        'id': event.get('id'),
+        'homeTeam': home_team,
+        'awayTeam': away_team,
+        'startTime': event.get('startTime'),
+        'league': event.get('leagueID', 'Unknown'),
+        'markets': []
+    }
     
-    for event in events:
-        spread_markets = []
+    # Extract odds information
+    spread_markets = []
+    odds = event.get('odds', {})
+    for odd_id, odd_data in odds.items():
+        # For this example, we're simplifying by focusing on basic odds
+        market_name = odd_data.get('name', 'Unknown')
         
-        # Look for markets that might be spread markets
-        for market in event['markets']:
-            market_type = market['type'].lower()
-            
-            # Check for common spread market identifiers
-            is_spread = (
-                'spread' in market_type or 
-                'handicap' in market_type or
-                (('home' in market_type or 'away' in market_type) and 
-                 ('plus' in market_type or 'minus' in market_type))
-            )
-            
-            # Also check for point spread markets
-            if 'points' in market_type and any(x in market_type for x in ['ou', 'over', 'under', 'hdp']):
-                is_spread = True
-                
-            if is_spread:
-                spread_markets.append(market)
+        # Try to make a more descriptive name if it's unknown
+        if market_name == 'Unknown' and '-' in odd_id:
+            # Extract information from the odd_id itself
+            parts = odd_id.split('-')
+            if len(parts) >= 3:
+                market_type = parts[0]  # e.g., "points"
+                team_side = parts[1]    # e.g., "home", "away", "all"
+                time_period = parts[2]  # e.g., "reg" (regulation time)
+                market_name = f"{market_type.capitalize()} {team_side} {time_period}"
+        
+        processed_market = {
+            'type': odd_id,
+            'name': market_name,
+            'odds': odd_data.get('odds')
+        }
         
-        # If we found spread markets, add this event
-        if spread_markets:
-            events_with_spreads.append({
-                'id': event['id'],
-                'homeTeam': event['homeTeam'],
-                'awayTeam': event['awayTeam'],
-                'startTime': event['startTime'],
-                'league': event['league'],
-                'markets': spread_markets
-            })
-    
-    # Save spread markets data
-    with open("soccer_spread_markets.json", "w") as f:
-        json.dump(events_with_spreads, f, indent=2)
-    print(f"Found {len(events_with_spreads)} events with spread markets")
-    print("Spread markets saved to soccer_spread_markets.json")
-    
-    return events_with_spreads
+        processed_event['markets'].append(processed_market)
+        
+        # Look for markets that might be spread markets
+        if SPREAD_MARKET_RE.search(odd_id) is not None:
+            spread_markets.append(processed_market)
+    
+    return processed_event, spread_markets
 
-def print_events_summary(events):
+def print_events_summary(events, total=None):
     """
     Print a summary of the events and their odds.
     
     Args:
-        events (list): List of processed events
+        events (list): Processed events; only the first SUMMARY_EVENTS are shown
+        total (int, optional): Number of events summarized, if more than were passed
     """
-    print("\n=== Soccer Events Summary ===")
-    
-    for i, event in enumerate(events[:5], 1):  # Limit to first 5 for display
-        print(f"\n{i}. {event['homeTeam']} vs {event['awayTeam']}")
-        print(f"   League: {event['league']}")
-        print(f"   Start Time: {event['startTime']}")
-        print(f"   Available Markets: {len(event['markets'])}")
+    if total is None:
+        total = len(events)
+    
+    # Collect the summary and write it to stdout in one go
+    out = io.StringIO()
+    print("\n=== Soccer Events Summary ===", file=out)
+    
+    for i, event in enumerate(events[:SUMMARY_EVENTS], 1):  # Limit the display
+        print(f"\n{i}. {event['homeTeam']} vs {event['awayTeam']}", file=out)
+        print(f"   League: {event['league']}", file=out)
+        print(f"   Start Time: {event['startTime']}", file=out)
+        print(f"   Available Markets: {len(event['markets'])}", file=out)
         
         # Display first few markets as examples
         for j, market in enumerate(event['markets'][:3], 1):
-            print(f"     {j}. {market['name']} (Type: {market['type']})")
+            print(f"     {j}. {market['name']} (Type: {market['type']})", file=out)
             if isinstance(market['odds'], (int, float)):
-                print(f"        Odds: {market['odds']}")
+                print(f"        Odds: {market['odds']}", file=out)
             elif isinstance(market['odds'], dict):
                 for k, v in market['odds'].items():
-                    print(f"        {k}: {v}")
+                    print(f"        {k}: {v}", file=out)
             else:
-                print(f"        Odds format: {type(market['odds'])}")
+                print(f"        Odds format: {type(market['odds'])}", file=out)
     
-    if len(events) > 5:
-        print(f"\n...and {len(events) - 5} more events")
+    if total > SUMMARY_EVENTS:
+        print(f"\n...and {total - SUMMARY_EVENTS} more events", file=out)
+    
+    sys.stdout.write(out.getvalue())
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch soccer odds from SportsGameOdds")
+    parser.add_argument("api_key", nargs="?", help="SportsGameOdds API key (used when config.yaml is missing)")
+    parser.add_argument("--verbose", action="store_true", help="Print the structure of the first event")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output files")
+    args = parser.parse_args()
+    
     # Load configuration or get API key
     config = load_config()
     if not config:
         # Check if API key is provided as command-line argument
-        if len(sys.argv) > 1:
-            api_key = sys.argv[1]
+        if args.api_key:
+            api_key = args.api_key
         else:
             api_key = input("Enter your SportsGameOdds API key: ")
     else:
         # Try to get API key from config
         try:
-            api_key = None
-            for sportsbook in config.get('apis', {}).get('sportsbooks', []):
-                if sportsbook.get('name') == 'sportsgameodds':
-                    api_key = sportsbook.get('api_key')
-                    break
-                    
+            api_key = _index_sportsbooks(config).get('sportsgameodds', {}).get('api_key')
+            
             if not api_key:
                 api_key = input("API key not found in config. Enter your SportsGameOdds API key: ")
         except Exception as e:
             print(f"Error reading config: {str(e)}")
             api_key = input("Enter your SportsGameOdds API key: ")
     
-    # Fetch events with odds
-    print("\n1. Fetching soccer events")
-    events = fetch_soccer_events_with_odds(api_key, "MLS")  # Start with MLS since we know it works
+    # Start from an empty raw pages directory so pages from earlier runs don't
+    # sit next to this run's
+    shutil.rmtree(RAW_PAGES_DIR, ignore_errors=True)
     
-    if not events:
-        print("\nNo MLS events found. Let's try with other leagues.")
-        soccer_leagues = ["EPL", "LA_LIGA", "SERIE_A", "BUNDESLIGA", "LIGUE_1", "CHAMPIONS_LEAGUE"]
+    # Fetch events with odds, reusing one connection pool for every league
+    print("\n1. Fetching soccer events")
+    with create_session(api_key) as session:
+        events = fetch_soccer_events_with_odds(session, "MLS", raw_dir=RAW_PAGES_DIR)  # Start with MLS since we know it works
         
-        for league in soccer_leagues:
-            print(f"\nTrying with league: {league}")
-            events = fetch_soccer_events_with_odds(api_key, league)
-            if events:
-                print(f"Found events for {league}!")
-                break
+        if not events:
+            print("\nNo MLS events found. Let's try with other leagues.")
+            soccer_leagues = ["EPL", "LA_LIGA", "SERIE_A", "BUNDESLIGA", "LIGUE_1", "CHAMPIONS_LEAGUE"]
+            
+            for league in soccer_leagues:
+                print(f"\nTrying with league: {league}")
+                events = fetch_soccer_events_with_odds(session, league, raw_dir=RAW_PAGES_DIR)
+                if events:
+                    print(f"Found events for {league}!")
+                    break
     
     if not events:
         print("\nCould not retrieve any soccer events. Please check your API key or try again later.")
         return
     
-    # Process events
-    print("\n2. Processing events")
-    processed_events = process_and_save_events(events)
-    
-    # Extract spread markets for the Kalshi Odds Comparison tool
-    print("\n3. Extracting spread markets")
-    spread_events = extract_spread_markets(processed_events)
+    # Process events and extract spread markets for the Kalshi Odds Comparison tool
+    print("\n2. Processing events and extracting spread markets")
+    processed_preview, processed_count, spread_preview, spread_count = process_events(
+        events, verbose=args.verbose, pretty=args.pretty
+    )
     
     # Print summary
-    print("\n4. Events summary")
-    print_events_summary(processed_events)
+    print("\n3. Events summary")
+    print_events_summary(processed_preview, processed_count)
     
     # Print spread markets summary if available
-    if spread_events:
-        print("\n5. Spread Markets Summary")
-        print_events_summary(spread_events)
+    if spread_count:
+        print("\n4. Spread Markets Summary")
+        print_events_summary(spread_preview, spread_count)
     else:
-        print("\n5. No spread markets found in the events")
+        print("\n4. No spread markets found in the events")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,65 +3,94 @@
 Script to inspect the exact structure of the SportsGameOdds API response.
 """
 
+import io
 import requests
-import json
-import pprint
+import orjson
+import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils.formatting import format_json
 
-def inspect_api_response(api_key):
+def create_session(api_key):
+    """
+    Create a pooled session for SportsGameOdds requests.
+    
+    Args:
+        api_key (str): SportsGameOdds API key, sent with every request
+        
+    Returns:
+        requests.Session: Session with keep-alive connection pooling and retries
+            on transient upstream errors
+    """
+    session = requests.Session()
+    session.headers.update({"X-API-Key": api_key})
+    
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry))
+    return session
+
+def inspect_api_response(session):
     """Get and inspect the structure of the API response."""
     url = "https://api.sportsgameodds.com/v2/sports/"
-    headers = {
-        "X-API-Key": api_key
-    }
     
-    print(f"Connecting to {url} with API key: {api_key}")
+    # Collect the report and write it to stdout in one go
+    out = io.StringIO()
+    print(f"Connecting to {url} with API key: {session.headers['X-API-Key']}", file=out)
     
     try:
-        response = requests.get(url, headers=headers)
+        response = session.get(url, timeout=(3.05, 30))
         status_code = response.status_code
-        print(f"Status Code: {status_code}")
+        print(f"Status Code: {status_code}", file=out)
         
         if status_code == 200:
             # Get the raw response
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Save the response to a file
-            with open("api_raw_response.json", "w") as f:
-                json.dump(data, f, indent=2)
-            print("\nFull response saved to api_raw_response.json")
+            with open("api_raw_response.json", "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            print("\nFull response saved to api_raw_response.json", file=out)
             
             # Print the type and structure
-            print(f"\nResponse Type: {type(data)}")
-            print("\nResponse Structure:")
-            pprint.pprint(data, depth=2)
+            print(f"\nResponse Type: {type(data)}", file=out)
+            print("\nResponse Structure:", file=out)
+            print(format_json(data, depth=2), file=out)
             
             # If it's a dictionary, print the keys
             if isinstance(data, dict):
-                print("\nTop-level keys:", list(data.keys()))
+                print("\nTop-level keys:", list(data.keys()), file=out)
                 
                 # Check if 'data' key exists
                 if 'data' in data:
-                    print("\nData key type:", type(data['data']))
+                    print("\nData key type:", type(data['data']), file=out)
                     if isinstance(data['data'], list):
-                        print(f"Number of items in data list: {len(data['data'])}")
+                        print(f"Number of items in data list: {len(data['data'])}", file=out)
                         if data['data']:
-                            print("\nFirst item in data list:")
-                            pprint.pprint(data['data'][0])
+                            print("\nFirst item in data list:", file=out)
+                            print(format_json(data['data'][0]), file=out)
             
             # If it's a list, print the length and first item
             elif isinstance(data, list):
-                print(f"\nNumber of items in list: {len(data)}")
+                print(f"\nNumber of items in list: {len(data)}", file=out)
                 if data:
-                    print("\nFirst item:")
-                    pprint.pprint(data[0])
+                    print("\nFirst item:", file=out)
+                    print(format_json(data[0]), file=out)
         else:
-            print(f"Error: {response.text}")
+            print(f"Error: {response.text}", file=out)
     
     except Exception as e:
-        print(f"Exception occurred: {str(e)}")
+        print(f"Exception occurred: {str(e)}", file=out)
+    
+    finally:
+        sys.stdout.write(out.getvalue())
 
 if __name__ == "__main__":
     # Your SportsGameOdds API key
     api_key = "bf9f835f4831b0f04e32e612dd07250b"
     
-    inspect_api_response(api_key)
\ No newline at end of file
+    with create_session(api_key) as session:
+        inspect_api_response(session)
\ No newline at end of file
@@ -3,9 +3,14 @@
 Script to inspect the exact structure of the SportsGameOdds API response.
 """
 
-import requests
-import json
-import pprint
+import io
+import orjson
+import sys
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+from src.utils.formatting import format_json
 
 def inspect_api_response(api_key):
     """Get and inspect the structure of the API response."""
@@ -14,51 +19,61 @@ def inspect_api_response(api_key):
         "X-API-Key": api_key
     }
     
-    print(f"Connecting to {url} with API key: {api_key}")
+    # Collect the report and write it to stdout in one go
+    out = io.StringIO()
+    
+    print(f"Connecting to {url} with API key: {api_key}", file=out)
     
     try:
-        response = requests.get(url, headers=headers)
+        # Cache the response on disk so re-running the inspection is instant
+        with CachedSession("sgo_cache", backend="sqlite", expire_after=timedelta(days=1), stale_if_error=True) as session:
+            retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+            session.mount("https://", HTTPAdapter(max_retries=retry))
+            response = session.get(url, headers=headers, timeout=(3.05, 30))
         status_code = response.status_code
-        print(f"Status Code: {status_code}")
+        print(f"Status Code: {status_code}", file=out)
         
         if status_code == 200:
             # Get the raw response
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Save the response to a file
-            with open("api_raw_response.json", "w") as f:
-                json.dump(data, f, indent=2)
-            print("\nFull response saved to api_raw_response.json")
+            with open("api_raw_response.json", "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            print("\nFull response saved to api_raw_response.json", file=out)
             
             # Print the type and structure
-            print(f"\nResponse Type: {type(data)}")
-            print("\nResponse Structure:")
-            pprint.pprint(data, depth=2)
+            print(f"\nResponse Type: {type(data)}", file=out)
+            print("\nResponse Structure:", file=out)
+            print(format_json(data, depth=2), file=out)
             
             # If it's a dictionary, print the keys
             if isinstance(data, dict):
-                print("\nTop-level keys:", list(data.keys()))
+                print("\nTop-level keys:", list(data.keys()), file=out)
                 
                 # Check if 'data' key exists
                 if 'data' in data:
-                    print("\nData key type:", type(data['data']))
+                    print("\nData key type:", type(data['data']), file=out)
                     if isinstance(data['data'], list):
-                        print(f"Number of items in data list: {len(data['data'])}")
+                        print(f"Number of items in data list: {len(data['data'])}", file=out)
                         if data['data']:
-                            print("\nFirst item in data list:")
-                            pprint.pprint(data['data'][0])
+                            print("\nFirst item in data list:", file=out)
+                            print(format_json(data['data'][0]), file=out)
             
             # If it's a list, print the length and first item
             elif isinstance(data, list):
-                print(f"\nNumber of items in list: {len(data)}")
+                print(f"\nNumber of items in list: {len(data)}", file=out)
                 if data:
-                    print("\nFirst item:")
-                    pprint.pprint(data[0])
+                    print("\nFirst item:", file=out)
+                    print(format_json(data[0]), file=out)
         else:
-            print(f"Error: {response.text}")
+            print(f"Error: {response.text}", file=out)
     
     except Exception as e:
-        print(f"Exception occurred: {str(e)}")
+        print(f"Exception occurred: {str(e)}", file=out)
+    
+    finally:
+        sys.stdout.write(out.getvalue())
 
 if __name__ == "__main__":
     # Your SportsGameOdds API key
@@ -3,39 +3,46 @@
 Very simple script to test different API endpoints for SportsGameOdds.
 """
 
-import requests
-import json
+import io
+import orjson
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 
-def test_endpoint(api_key, endpoint):
-    """Test a specific API endpoint."""
+def test_endpoint(session, endpoint):
+    """Test a specific API endpoint using a shared session."""
     url = f"https://api.sportsgameodds.com{endpoint}"
-    headers = {
-        "X-API-Key": api_key
-    }
     
-    print(f"\n\nTesting endpoint: {url}")
+    # Collect the endpoint's report and write it to stdout in one go
+    out = io.StringIO()
+    print(f"\n\nTesting endpoint: {url}", file=out)
     
     try:
-        response = requests.get(url, headers=headers)
+        response = session.get(url, timeout=(3.05, 30))
         status_code = response.status_code
-        print(f"Status Code: {status_code}")
+        print(f"Status Code: {status_code}", file=out)
         
         if status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Save the response to a file
             filename = f"response_{endpoint.replace('/', '_')}.json"
-            with open(filename, "w") as f:
-                json.dump(data, f, indent=2)
-            print(f"Response saved to {filename}")
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            print(f"Response saved to {filename}", file=out)
             return True
         else:
-            print(f"Error: {response.text}")
+            print(f"Error: {response.text}", file=out)
             return False
     
     except Exception as e:
-        print(f"Exception occurred: {str(e)}")
+        print(f"Exception occurred: {str(e)}", file=out)
         return False
+    
+    finally:
+        sys.stdout.write(out.getvalue())
 
 def main():
     # Get API key
@@ -54,19 +61,25 @@ def main():
         "/v2/events"
     ]
     
-    # Test each endpoint
-    success_endpoints = []
-    for endpoint in endpoints:
-        success = test_endpoint(api_key, endpoint)
-        if success:
-            success_endpoints.append(endpoint)
+    # Test all endpoints concurrently over one pooled session, caching
+    # responses so repeated endpoint discovery doesn't re-hit the API
+    with CachedSession("sgo_cache", backend="sqlite", expire_after=timedelta(minutes=5), stale_if_error=True) as session:
+        session.headers.update({"X-API-Key": api_key})
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        session.mount("https://", HTTPAdapter(pool_maxsize=len(endpoints), max_retries=retry))
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            results = list(executor.map(lambda endpoint: test_endpoint(session, endpoint), endpoints))
+    
+    success_endpoints = [endpoint for endpoint, success in zip(endpoints, results) if success]
     
     # Summary
-    print("\n\n=== Summary ===")
-    print(f"Tested {len(endpoints)} endpoints")
-    print(f"Successful endpoints: {len(success_endpoints)}")
+    out = io.StringIO()
+    print("\n\n=== Summary ===", file=out)
+    print(f"Tested {len(endpoints)} endpoints", file=out)
+    print(f"Successful endpoints: {len(success_endpoints)}", file=out)
     for endpoint in success_endpoints:
-        print(f"  - {endpoint}")
+        print(f"  - {endpoint}", file=out)
+    sys.stdout.write(out.getvalue())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,4 @@
 # src/analysis/__init__.py
 """
 Analysis module for comparing odds and finding opportunities.
-"""
-
-# src/utils/__init__.py
 """
\ No newline at end of file
@@ -2,11 +2,22 @@
 Module for comparing odds between sportsbooks and Kalshi markets.
 """
 
+import numpy as np
+from collections import defaultdict
 from src.analysis.odds_converter import OddsConverter
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Length of the character n-grams indexing Kalshi market text. Every n-gram of
+# a team name also occurs in any text containing that name, so narrowing by
+# n-grams never drops a market the substring check would accept
+NGRAM_SIZE = 3
+
+def _ngrams(text):
+    """Get the set of NGRAM_SIZE-character substrings of text."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
 class OddsComparator:
     """Class for comparing odds and identifying opportunities."""
     
@@ -32,78 +43,175 @@ class OddsComparator:
         """
         opportunities = []
         
-        # Match sportsbook matches with corresponding Kalshi markets
+        # Index the Kalshi markets once instead of scanning them for every match
+        kalshi_index = self._build_kalshi_index(kalshi_markets)
+        
+        # Collect every spread line and the Kalshi markets matching it, so all
+        # probabilities and edges can be computed in a few array operations.
+        # Lines and pairs are kept column-wise: the numeric columns feed the
+        # array conversions directly and the rest is only read back for the
+        # pairs that get reported
+        line_matches = []
+        line_sportsbooks = []
+        line_teams = []
+        line_spreads = []
+        line_odds = []
+        pair_lines = []
+        pair_markets = []
+        pair_prices = []
+        
+        # The same game is usually listed by several sportsbooks, so remember
+        # the positions of the Kalshi markets found for each pair of teams
+        matching_cache = {}
+        
         for sportsbook_name, matches in sportsbook_data.items():
             for match in matches:
                 # Try to find corresponding Kalshi markets
-                match_kalshi_markets = self._find_matching_kalshi_markets(match, kalshi_markets)
+                teams = (match['home_team'], match['away_team'])
+                if teams not in matching_cache:
+                    matching_cache[teams] = self._find_matching_positions(match, kalshi_index)
+                match_positions = matching_cache[teams]
                 
-                if not match_kalshi_markets:
-                    logger.debug(f"No matching Kalshi markets found for {match['home_team']} vs {match['away_team']}")
+                if not match_positions:
+                    logger.debug("No matching Kalshi markets found for %s vs %s", *teams)
                     continue
                 
-                # Compare odds for each market
                 for market in match['markets']:
-                    if market['type'] == 'spread':
-                        # Check home team spread
-                        home_opportunities = self._compare_spread_odds(
-                            match=match,
-                            sportsbook=sportsbook_name,
-                            team='home',
-                            spread=market['home_spread'],
-                            odds=market['home_odds'],
-                            kalshi_markets=match_kalshi_markets
-                        )
-                        opportunities.extend(home_opportunities)
+                    if market['type'] != 'spread':
+                        continue
+                    
+                    # Check both the home and away team spreads
+                    for team in ('home', 'away'):
+                        spread = market[f'{team}_spread']
+                        team_name = match[f'{team}_team']
+                        line_index = len(line_odds)
+                        line_matches.append(match)
+                        line_sportsbooks.append(sportsbook_name)
+                        line_teams.append(team)
+                        line_spreads.append(spread)
+                        line_odds.append(market[f'{team}_odds'])
                         
-                        # Check away team spread
-                        away_opportunities = self._compare_spread_odds(
-                            match=match,
-                            sportsbook=sportsbook_name,
-                            team='away',
-                            spread=market['away_spread'],
-                            odds=market['away_odds'],
-                            kalshi_markets=match_kalshi_markets
-                        )
-                        opportunities.extend(away_opportunities)
-        
-        # Sort opportunities by edge (highest first)
-        opportunities.sort(key=lambda x: x['edge_percentage'], reverse=True)
+                        # This is a simplistic approach - in reality, you'd need more sophisticated matching
+                        for position in match_positions:
+                            kalshi_market = kalshi_markets[position]
+                            texts = kalshi_index['texts'][position]
+                            if self._is_matching_spread_market(kalshi_market, team_name, spread, texts):
+                                pair_lines.append(line_index)
+                                pair_markets.append(kalshi_market)
+                                pair_prices.append(kalshi_market['yes_ask'])
+        
+        if not pair_markets:
+            return opportunities
+        
+        # Use 'yes_ask' for conservative comparison
+        sportsbook_probs = OddsConverter.american_to_probability_array(line_odds)
+        kalshi_probs = OddsConverter.kalshi_price_to_probability_array(pair_prices)
+        pair_sportsbook_probs = sportsbook_probs[np.asarray(pair_lines, dtype=np.intp)]
+        edges = np.abs(pair_sportsbook_probs - kalshi_probs)
+        
+        # Record an opportunity for every pair whose edge exceeds the threshold,
+        # ordered by edge (highest first)
+        selected = np.flatnonzero(edges >= self.threshold)
+        selected = selected[np.argsort(-edges[selected], kind='stable')]
+        
+        for i in selected:
+            line_index = pair_lines[i]
+            opportunities.append(self._build_opportunity(
+                match=line_matches[line_index],
+                sportsbook=line_sportsbooks[line_index],
+                team=line_teams[line_index],
+                spread=line_spreads[line_index],
+                odds=line_odds[line_index],
+                sportsbook_prob=pair_sportsbook_probs[i],
+                kalshi_market=pair_markets[i],
+                kalshi_prob=kalshi_probs[i],
+                edge=edges[i]
+            ))
         
         return opportunities
     
-    def _find_matching_kalshi_markets(self, match, kalshi_markets):
+    def _build_kalshi_index(self, kalshi_markets):
+        """
+        Build a character n-gram index over Kalshi market titles and subtitles.
+        
+        Args:
+            kalshi_markets (list): List of Kalshi markets
+            
+        Returns:
+            dict: 'ngrams' maps each lowercased n-gram to the positions of the markets
+                  containing it, 'texts' holds the lowercased (title, subtitle) per market
+        """
+        ngram_index = defaultdict(set)
+        texts = []
+        
+        for position, market in enumerate(kalshi_markets):
+            title = market['title'].lower()
+            subtitle = market['subtitle'].lower()
+            texts.append((title, subtitle))
+            
+            for ngram in _ngrams(title) | _ngrams(subtitle):
+                ngram_index[ngram].add(position)
+        
+        return {'ngrams': ngram_index, 'texts': texts}
+    
+    def _find_matching_kalshi_markets(self, match, kalshi_markets, kalshi_index=None):
         """
         Find Kalshi markets that correspond to a sportsbook match.
         
         Args:
             match (dict): Sportsbook match data
             kalshi_markets (list): List of Kalshi markets
+            kalshi_index (dict, optional): Index from _build_kalshi_index for kalshi_markets
             
         Returns:
             list: Matching Kalshi markets
         """
+        if kalshi_index is None:
+            kalshi_index = self._build_kalshi_index(kalshi_markets)
+        
+        return [kalshi_markets[position] for position in self._find_matching_positions(match, kalshi_index)]
+    
+    def _find_matching_positions(self, match, kalshi_index):
+        """
+        Find the positions of the Kalshi markets that correspond to a sportsbook match.
+        
+        Args:
+            match (dict): Sportsbook match data
+            kalshi_index (dict): Index from _build_kalshi_index
+            
+        Returns:
+            list: Positions of the matching markets, in their original order
+        """
         # In a real implementation, this would be more sophisticated
         # For now, we'll do simple text matching on team names
         
         home_team = match['home_team'].lower()
         away_team = match['away_team'].lower()
         
-        matching_markets = []
+        # Only markets containing every n-gram of both team names can match;
+        # names shorter than an n-gram leave the candidates unrestricted
+        team_ngrams = _ngrams(home_team) | _ngrams(away_team)
+        if team_ngrams:
+            ngram_index = kalshi_index['ngrams']
+            postings = sorted((ngram_index.get(ngram, set()) for ngram in team_ngrams), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            candidates = range(len(kalshi_index['texts']))
         
-        for market in kalshi_markets:
-            title = market['title'].lower()
-            subtitle = market['subtitle'].lower()
+        matching_positions = []
+        
+        for position in sorted(candidates):
+            title, subtitle = kalshi_index['texts'][position]
             
             # Check if both team names appear in the market title or subtitle
             if (home_team in title or home_team in subtitle) and (away_team in title or away_team in subtitle):
-                matching_markets.append(market)
+                matching_positions.append(position)
         
-        return matching_markets
+        return matching_positions
     
-    def _compare_spread_odds(self, match, sportsbook, team, spread, odds, kalshi_markets):
+    def _build_opportunity(self, match, sportsbook, team, spread, odds, sportsbook_prob, kalshi_market, kalshi_prob, edge):
         """
-        Compare spread odds between a sportsbook and Kalshi markets.
+        Build the opportunity record for a sportsbook spread and a Kalshi market.
         
         Args:
             match (dict): Sportsbook match data
@@ -111,46 +219,27 @@ class OddsComparator:
             team (str): 'home' or 'away'
             spread (float): Spread value
             odds (int): American odds
-            kalshi_markets (list): Matching Kalshi markets
+            sportsbook_prob (float): Implied probability of the sportsbook odds
+            kalshi_market (dict): Matching Kalshi market
+            kalshi_prob (float): Implied probability of the Kalshi price
+            edge (float): Absolute difference between the two probabilities
             
         Returns:
-            list: Opportunities found
+            dict: Opportunity data
         """
-        opportunities = []
-        
-        # Calculate implied probability from sportsbook odds
-        sportsbook_prob = OddsConverter.american_to_probability(odds)
-        
-        # Find matching Kalshi markets based on the spread
-        team_name = match[f'{team}_team']
-        for kalshi_market in kalshi_markets:
-            # Check if this Kalshi market matches the spread
-            # This is a simplistic approach - in reality, you'd need more sophisticated matching
-            if self._is_matching_spread_market(kalshi_market, team_name, spread):
-                # Get Kalshi price and implied probability
-                kalshi_price = kalshi_market['yes_ask']  # Use 'yes_ask' for conservative comparison
-                kalshi_prob = OddsConverter.kalshi_price_to_probability(kalshi_price)
-                
-                # Calculate edge
-                edge = abs(sportsbook_prob - kalshi_prob)
-                
-                # If edge exceeds threshold, record opportunity
-                if edge >= self.threshold:
-                    opportunities.append({
-                        'match_name': f"{match['home_team']} vs {match['away_team']}",
-                        'sportsbook': sportsbook,
-                        'sportsbook_market': f"{team_name} {spread:+g}",
-                        'sportsbook_odds': odds,
-                        'sportsbook_implied_prob': round(sportsbook_prob, 2),
-                        'kalshi_contract': kalshi_market['ticker'],
-                        'kalshi_price': kalshi_price,
-                        'kalshi_implied_prob': round(kalshi_prob, 2),
-                        'edge_percentage': round(edge, 2)
-                    })
-        
-        return opportunities
+        return {
+            'match_name': f"{match['home_team']} vs {match['away_team']}",
+            'sportsbook': sportsbook,
+            'sportsbook_market': f"{match[f'{team}_team']} {spread:+g}",
+            'sportsbook_odds': odds,
+            'sportsbook_implied_prob': round(float(sportsbook_prob), 2),
+            'kalshi_contract': kalshi_market['ticker'],
+            'kalshi_price': kalshi_market['yes_ask'],
+            'kalshi_implied_prob': round(float(kalshi_prob), 2),
+            'edge_percentage': round(float(edge), 2)
+        }
     
-    def _is_matching_spread_market(self, kalshi_market, team_name, spread):
+    def _is_matching_spread_market(self, kalshi_market, team_name, spread, texts=None):
         """
         Determine if a Kalshi market matches a specific spread.
         
@@ -158,6 +247,7 @@ class OddsComparator:
             kalshi_market (dict): Kalshi market data
             team_name (str): Team name
             spread (float): Spread value
+            texts (tuple, optional): Already lowercased (title, subtitle) of the market
             
         Returns:
             bool: True if the market matches the spread
@@ -166,8 +256,9 @@ class OddsComparator:
         # In a real application, you'd need to implement sophisticated matching logic
         
         # Check if team name is in the market title or subtitle
-        title = kalshi_market['title'].lower()
-        subtitle = kalshi_market['subtitle'].lower()
+        if texts is None:
+            texts = (kalshi_market['title'].lower(), kalshi_market['subtitle'].lower())
+        title, subtitle = texts
         team_name_lower = team_name.lower()
         
         if team_name_lower not in title and team_name_lower not in subtitle:
@@ -2,25 +2,53 @@
 Module for converting between different odds formats and calculating implied probabilities.
 """
 
+import math
+import numpy as np
+from functools import lru_cache
+
 class OddsConverter:
     """Utility class for converting between different odds formats."""
     
     @staticmethod
+    @lru_cache(maxsize=2048)
     def american_to_decimal(american_odds):
         """
         Convert American odds to decimal odds.
         
+        Results are memoized since sportsbook odds cluster around a few values.
+        
         Args:
             american_odds (int): Odds in American format (e.g., -110, +240)
             
         Returns:
-            float: Odds in decimal format
+            float: Odds in decimal format, or NaN for odds of 0 (no price)
         """
+        if american_odds == 0:
+            return float('nan')
         if american_odds > 0:
             return (american_odds / 100) + 1
         else:
             return (100 / abs(american_odds)) + 1
     
+    @staticmethod
+    def american_to_decimal_array(american_odds):
+        """
+        Convert a batch of American odds to decimal odds.
+        
+        Args:
+            american_odds (array-like): Odds in American format
+            
+        Returns:
+            numpy.ndarray: Odds in decimal format, NaN where the odds are 0 (no price)
+        """
+        odds = np.asarray(american_odds, dtype=np.float64)
+        
+        # np.where evaluates both branches; the division by zero for odds of 0
+        # is discarded in favour of NaN
+        with np.errstate(divide='ignore'):
+            decimal = np.where(odds > 0, odds / 100 + 1, 100 / np.abs(odds) + 1)
+        return np.where(odds == 0, np.nan, decimal)
+    
     @staticmethod
     def decimal_to_american(decimal_odds):
         """
@@ -30,12 +58,36 @@ class OddsConverter:
             decimal_odds (float): Odds in decimal format
             
         Returns:
-            int: Odds in American format
+            int: Odds in American format, or 0 (no price) unless the odds are
+                finite and greater than 1
         """
+        if not (math.isfinite(decimal_odds) and decimal_odds > 1):
+            return 0
         if decimal_odds >= 2:
-            return int((decimal_odds - 1) * 100)
+            return int(round((decimal_odds - 1) * 100))
         else:
-            return int(-100 / (decimal_odds - 1))
+            return int(round(-100 / (decimal_odds - 1)))
+    
+    @staticmethod
+    def decimal_to_american_array(decimal_odds):
+        """
+        Convert a batch of decimal odds to American odds.
+        
+        Args:
+            decimal_odds (array-like): Odds in decimal format
+            
+        Returns:
+            numpy.ndarray: Odds in American format as int64, 0 (no price) where
+                the odds are not finite and greater than 1
+        """
+        odds = np.asarray(decimal_odds, dtype=np.float64)
+        valid = np.isfinite(odds) & (odds > 1)
+        
+        # np.where evaluates both branches; the unused one may divide by zero,
+        # and invalid prices are masked out before the integer cast
+        with np.errstate(divide='ignore', invalid='ignore'):
+            american = np.where(odds >= 2, (odds - 1) * 100, -100 / (odds - 1))
+        return np.where(valid, np.rint(american), 0).astype(np.int64)
     
     @staticmethod
     def decimal_to_probability(decimal_odds):
@@ -51,19 +103,51 @@ class OddsConverter:
         return (1 / decimal_odds) * 100
     
     @staticmethod
+    def decimal_to_probability_array(decimal_odds):
+        """
+        Convert a batch of decimal odds to implied probabilities.
+        
+        Args:
+            decimal_odds (array-like): Odds in decimal format
+            
+        Returns:
+            numpy.ndarray: Implied probabilities as percentages (0-100)
+        """
+        return 100 / np.asarray(decimal_odds, dtype=np.float64)
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
     def american_to_probability(american_odds):
         """
         Convert American odds to implied probability.
         
+        Results are memoized since sportsbook odds cluster around a few values.
+        
         Args:
             american_odds (int): Odds in American format
             
         Returns:
-            float: Implied probability as a percentage (0-100)
+            float: Implied probability as a percentage (0-100), or NaN for odds of 0
         """
         decimal = OddsConverter.american_to_decimal(american_odds)
         return OddsConverter.decimal_to_probability(decimal)
     
+    @staticmethod
+    def american_to_probability_array(american_odds):
+        """
+        Convert a batch of American odds to implied probabilities.
+        
+        Args:
+            american_odds (array-like): Odds in American format
+            
+        Returns:
+            numpy.ndarray: Implied probabilities as percentages (0-100), NaN where
+                the odds are 0
+        """
+        # Odds of 0 mean no price; NaN keeps them from clearing any threshold
+        decimal = OddsConverter.american_to_decimal_array(american_odds)
+        return OddsConverter.decimal_to_probability_array(decimal)
+    
     @staticmethod
     def probability_to_decimal(probability):
         """
@@ -77,6 +161,19 @@ class OddsConverter:
         """
         return 100 / probability
     
+    @staticmethod
+    def probability_to_decimal_array(probabilities):
+        """
+        Convert a batch of probabilities to decimal odds.
+        
+        Args:
+            probabilities (array-like): Probabilities as percentages (0-100)
+            
+        Returns:
+            numpy.ndarray: Odds in decimal format
+        """
+        return 100 / np.asarray(probabilities, dtype=np.float64)
+    
     @staticmethod
     def kalshi_price_to_probability(price):
         """
@@ -91,6 +188,19 @@ class OddsConverter:
         # Kalshi prices are in cents (0-100), which directly correlate to probability
         return float(price)
     
+    @staticmethod
+    def kalshi_price_to_probability_array(prices):
+        """
+        Convert a batch of Kalshi prices to implied probabilities.
+        
+        Args:
+            prices (array-like): Kalshi prices (0-100); missing prices become NaN
+            
+        Returns:
+            numpy.ndarray: Implied probabilities as percentages (0-100)
+        """
+        return np.asarray(prices, dtype=np.float64)
+    
     @staticmethod
     def probability_to_kalshi_price(probability):
         """
@@ -0,0 +1,344 @@
+"""
+Shared HTTP layer for the API clients.
+Creating one pooled session and passing it to every client lets all API
+calls reuse the same keep-alive connections. Idempotent GETs go through
+fetch_payload, which retries transient failures and honours a per-client
+circuit breaker. Every request is bounded by a ClientTimeout, and by the
+overall deadline set with the deadline() context manager, if any.
+"""
+
+import aiohttp
+import asyncio
+import contextvars
+import ijson
+import importlib.util
+import msgspec
+import orjson
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# aiohttp decodes brotli bodies when the brotli package is available, but only
+# advertises gzip and deflate by default
+if importlib.util.find_spec("brotli") is not None:
+    ACCEPT_ENCODING = "br, gzip, deflate"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Prefer MessagePack bodies when an upstream can serve them, JSON otherwise
+ACCEPT_MSGPACK = "application/x-msgpack, application/msgpack;q=0.95, application/json;q=0.9"
+MSGPACK_CONTENT_TYPES = frozenset({"application/x-msgpack", "application/msgpack", "application/vnd.msgpack"})
+
+# Per-request timeouts in seconds; the total is further capped by any deadline
+DEFAULT_TOTAL_TIMEOUT = 30
+CONNECT_TIMEOUT = 5
+SOCK_READ_TIMEOUT = 15
+
+# Monotonic time by which the current task's requests must finish; tasks started
+# under deadline() (including those created by asyncio.gather) inherit it
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+# Responses worth retrying; other 4xx (e.g. auth failures) are returned immediately
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class CircuitOpenError(Exception):
+    """Raised when a request is short-circuited because its upstream is failing."""
+
+class CircuitBreaker:
+    """Fail fast on an upstream whose recent requests are mostly failing."""
+    
+    def __init__(self, failure_threshold=0.5, sampling_duration=10, break_duration=30, minimum_throughput=3):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold (float): Failure ratio within the sampling window that opens the circuit
+            sampling_duration (float): Seconds of request history considered
+            break_duration (float): Seconds the circuit stays open before a trial request
+            minimum_throughput (int): Requests needed in the window before the circuit can open
+        """
+        self.failure_threshold = failure_threshold
+        self.sampling_duration = sampling_duration
+        self.break_duration = break_duration
+        self.minimum_throughput = minimum_throughput
+        self._outcomes = deque()
+        self._opened_at = None
+        self._probe_started_at = None
+    
+    def allow_request(self):
+        """
+        Check whether a request may be sent.
+        
+        Returns:
+            bool: False while the circuit is open, or half-open with a trial in flight
+        """
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.break_duration:
+            return False
+        # Half-open: let a single trial request through once the break has
+        # elapsed; another is only admitted if that trial never reported back
+        if self._probe_started_at is not None and now - self._probe_started_at < self.break_duration:
+            return False
+        self._probe_started_at = now
+        return True
+    
+    @property
+    def trial_in_flight(self):
+        """bool: Whether a half-open trial request has been admitted and not yet reported."""
+        return self._probe_started_at is not None
+    
+    def release_trial(self):
+        """End a trial request that finished without an outcome, so another may be admitted."""
+        self._probe_started_at = None
+    
+    def record_success(self):
+        """Record a successful request, closing the circuit if it was open."""
+        self._opened_at = None
+        self._probe_started_at = None
+        self._record(True)
+    
+    def record_failure(self):
+        """Record a failed request, opening the circuit if the failure ratio is too high."""
+        now = self._record(False)
+        if self._opened_at is not None:
+            # A failed trial request re-opens the circuit
+            self._opened_at = now
+            self._probe_started_at = None
+            return
+        if len(self._outcomes) >= self.minimum_throughput:
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self.failure_threshold:
+                self._opened_at = now
+    
+    def _record(self, ok):
+        """Append an outcome and drop those older than the sampling window."""
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        while self._outcomes and now - self._outcomes[0][0] > self.sampling_duration:
+            self._outcomes.popleft()
+        return now
+
+# ijson events carrying a scalar value
+_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+
+def _json_dumps(obj):
+    """Serialize request bodies with orjson; aiohttp expects a str."""
+    return orjson.dumps(obj).decode()
+
+@contextmanager
+def deadline(seconds):
+    """
+    Bound every request made inside the block by an overall deadline.
+    
+    Args:
+        seconds (float): Time budget for all requests in the block
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining_time():
+    """
+    Get the time left before the current deadline.
+    
+    Returns:
+        float: Seconds left, or None if no deadline is set
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+def request_timeout():
+    """
+    Build the timeout for the next request.
+    
+    Returns:
+        aiohttp.ClientTimeout: Timeout whose total fits in the remaining deadline
+        
+    Raises:
+        asyncio.TimeoutError: If the deadline has already passed
+    """
+    total = DEFAULT_TOTAL_TIMEOUT
+    remaining = remaining_time()
+    if remaining is not None:
+        if remaining <= 0:
+            raise asyncio.TimeoutError("Deadline exceeded before the request was sent")
+        total = min(total, remaining)
+    return aiohttp.ClientTimeout(total=total, connect=CONNECT_TIMEOUT, sock_read=SOCK_READ_TIMEOUT)
+
+def create_session(limit=100, limit_per_host=30, ttl_dns_cache=300, keepalive_timeout=75, total_timeout=DEFAULT_TOTAL_TIMEOUT):
+    """
+    Create a pooled HTTP session to share between API clients.
+    
+    Must be called from a running event loop.
+    
+    Args:
+        limit (int): Maximum number of open connections
+        limit_per_host (int): Maximum number of open connections per host
+        ttl_dns_cache (int): Seconds to cache DNS lookups
+        keepalive_timeout (float): Seconds to keep idle connections open
+        total_timeout (float): Total timeout in seconds for each request
+        
+    Returns:
+        aiohttp.ClientSession: Shared HTTP session
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=ttl_dns_cache,
+        keepalive_timeout=keepalive_timeout,
+        enable_cleanup_closed=True
+    )
+    
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=total_timeout),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+        json_serialize=_json_dumps
+    )
+
+async def read_payload(response, schema=None):
+    """
+    Decode a response body according to its content type.
+    
+    Args:
+        response (aiohttp.ClientResponse): Response to decode
+        schema (type, optional): msgspec type to decode and validate the body into
+        
+    Returns:
+        dict: Decoded MessagePack or JSON payload, or a schema instance if given
+    """
+    if response.content_type in MSGPACK_CONTENT_TYPES:
+        if schema is not None:
+            return msgspec.msgpack.decode(await response.read(), type=schema)
+        return msgspec.msgpack.decode(await response.read())
+    if schema is not None:
+        return msgspec.json.decode(await response.read(), type=schema)
+    # Parse the raw bytes directly; response.json() would decode them to str first
+    return orjson.loads(await response.read())
+
+async def iter_json_items(response, prefix, page_info=None, chunk_size=64 * 1024):
+    """
+    Yield the items under a prefix of a JSON body as the body streams in.
+    
+    Only the current chunk and the items parsed from it are held in memory,
+    instead of the whole body plus its fully decoded tree.
+    
+    Args:
+        response (aiohttp.ClientResponse): Response with a JSON body
+        prefix (str): ijson prefix of the items, e.g. 'markets.item'
+        page_info (dict, optional): Receives top-level scalar fields such as the cursor
+        chunk_size (int): Bytes read from the socket at a time
+        
+    Yields:
+        dict: Each decoded item
+    """
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    builder = None
+    
+    def drain():
+        nonlocal builder
+        for path, event, value in events:
+            if builder is not None:
+                builder.event(event, value)
+                if path == prefix and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif path == prefix and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif page_info is not None and "." not in path and event in _SCALAR_EVENTS:
+                page_info[path] = value
+        del events[:]
+    
+    async for chunk in response.content.iter_chunked(chunk_size):
+        parser.send(chunk)
+        for item in drain():
+            yield item
+    
+    parser.close()
+    for item in drain():
+        yield item
+
+async def fetch_payload(session, url, breaker=None, schema=None, decode=None, max_attempts=3, base_delay=0.5, max_delay=8.0, **kwargs):
+    """
+    GET a URL and decode its payload, retrying transient failures.
+    
+    Retries 429/5xx responses, timeouts, connection errors and truncated bodies with exponential
+    backoff and full jitter. Only use for idempotent requests. Each attempt's
+    timeout is capped by the current deadline, and no retry is scheduled past it.
+    
+    Args:
+        session (aiohttp.ClientSession): Session to send the request with
+        url (str): URL to fetch
+        breaker (CircuitBreaker, optional): Circuit breaker for the upstream host
+        schema (type, optional): msgspec type to decode the body into
+        decode (callable, optional): Coroutine function that decodes a 200
+            response instead of read_payload
+        max_attempts (int): Maximum number of attempts
+        base_delay (float): Backoff base in seconds
+        max_delay (float): Upper bound on a single backoff in seconds
+        **kwargs: Extra arguments passed to session.get
+        
+    Returns:
+        dict: Decoded response payload, a schema instance, or what decode returns
+        
+    Raises:
+        CircuitOpenError: If the breaker is open
+        aiohttp.ClientResponseError: If the final response is not 200
+        asyncio.TimeoutError: If a request times out or the deadline passes
+    """
+    for attempt in range(max_attempts):
+        if breaker and not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {url}")
+        # Only a half-open breaker has a trial in flight right after admitting us
+        is_trial = breaker is not None and breaker.trial_in_flight
+        
+        timeout = request_timeout()
+        try:
+            try:
+                async with session.get(url, timeout=timeout, **kwargs) as response:
+                    if response.status == 200:
+                        if decode is not None:
+                            payload = await decode(response)
+                        else:
+                            payload = await read_payload(response, schema)
+                        if breaker:
+                            breaker.record_success()
+                        return payload
+                    
+                    error = aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=await response.text()
+                    )
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+                error = e
+            
+            retryable = not isinstance(error, aiohttp.ClientResponseError) or error.status in RETRY_STATUSES
+            if breaker and retryable:
+                breaker.record_failure()
+        finally:
+            # A trial ending without an outcome (a non-retryable status, an
+            # undecodable body, cancellation) must not keep the circuit blocked
+            if is_trial:
+                breaker.release_trial()
+        
+        if not retryable or attempt == max_attempts - 1:
+            raise error
+        
+        delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            # The retry could not finish before the deadline
+            raise error
+        await asyncio.sleep(delay)
\ No newline at end of file
@@ -4,16 +4,22 @@ Kalshi API client for fetching market data.
 
 import aiohttp
 import asyncio
-import json
+import msgspec
+import orjson
 from datetime import datetime
+from src.data_collection.http import ACCEPT_MSGPACK, MSGPACK_CONTENT_TYPES, CircuitBreaker, CircuitOpenError, create_session, fetch_payload, iter_json_items, request_timeout
+from src.data_collection.schemas import KalshiMarket, KalshiMarketsResponse
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Largest page size the markets endpoint accepts
+MARKETS_PAGE_LIMIT = 1000
+
 class KalshiClient:
     """Client for interacting with Kalshi API."""
     
-    def __init__(self, base_url, email, password):
+    def __init__(self, base_url, email, password, session=None):
         """
         Initialize the Kalshi API client.
         
@@ -21,17 +27,68 @@ class KalshiClient:
             base_url (str): Base URL for Kalshi API
             email (str): Kalshi account email
             password (str): Kalshi account password
+            session (aiohttp.ClientSession, optional): Shared HTTP session; if not
+                given, the client creates and closes its own
         """
         self.base_url = base_url
         self.email = email
         self.password = password
         self.token = None
-        self.session = None
+        self._auth_lock = asyncio.Lock()
+        self.session = session
+        self._owns_session = session is None
+        self.breaker = CircuitBreaker()
+        
+        # Request pieces that do not change between calls
+        # Note: You might need to adjust this based on Kalshi's actual API structure
+        self._markets_url = f"{base_url}/markets"
+        self._markets_params = {
+            "status": "open",
+            "series_ticker": "SOCCER",  # This is a placeholder - adjust to Kalshi's actual parameter
+            "limit": MARKETS_PAGE_LIMIT
+        }
+        self._headers = None
+        self._headers_token = None
+    
+    def _markets_headers(self):
+        """
+        Get the markets request headers, rebuilt only when the token changes.
+        
+        Returns:
+            dict: Request headers
+        """
+        if self._headers is None or self._headers_token != self.token:
+            self._headers = {"Authorization": f"Bearer {self.token}", "Accept": ACCEPT_MSGPACK}
+            self._headers_token = self.token
+        return self._headers
+    
+    async def _ensure_ready(self):
+        """
+        Authenticate if needed, letting only one concurrent caller log in.
+        
+        Returns:
+            bool: True if the client holds a token
+        """
+        if self.token:
+            return True
+        
+        async with self._auth_lock:
+            # Another caller may have authenticated while we waited
+            if self.token:
+                return True
+            logger.info("Not authenticated with Kalshi yet. Authenticating...")
+            return await self.authenticate()
+    
+    async def _get_session(self):
+        """Get the shared HTTP session or create one owned by this client."""
+        if not self.session:
+            # A standalone client only talks to one host, so a small pool suffices
+            self.session = create_session(limit=20, keepalive_timeout=30)
+        return self.session
     
     async def authenticate(self):
         """Authenticate with Kalshi API and get access token."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        session = await self._get_session()
         
         url = f"{self.base_url}/login"
         payload = {
@@ -40,18 +97,18 @@ class KalshiClient:
         }
         
         try:
-            async with self.session.post(url, json=payload) as response:
+            async with session.post(url, json=payload, timeout=request_timeout()) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     self.token = data.get('token')
                     logger.info("Successfully authenticated with Kalshi API")
                     return True
                 else:
                     error_text = await response.text()
-                    logger.error(f"Failed to authenticate with Kalshi: {response.status} - {error_text}")
+                    logger.error("Failed to authenticate with Kalshi: %s - %s", response.status, error_text)
                     return False
         except Exception as e:
-            logger.error(f"Error during Kalshi authentication: {str(e)}")
+            logger.error("Error during Kalshi authentication: %s", e)
             return False
     
     async def get_soccer_markets(self):
@@ -61,59 +118,71 @@ class KalshiClient:
         Returns:
             list: List of soccer markets
         """
-        if not self.token:
-            logger.warning("Not authenticated with Kalshi. Attempting to authenticate...")
-            success = await self.authenticate()
-            if not success:
-                return []
+        if not await self._ensure_ready():
+            return []
         
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        
-        # Search for markets related to soccer
-        # Note: You might need to adjust this based on Kalshi's actual API structure
-        url = f"{self.base_url}/markets"
-        headers = {"Authorization": f"Bearer {self.token}"}
-        params = {
-            "status": "open",
-            "series_ticker": "SOCCER"  # This is a placeholder - adjust to Kalshi's actual parameter
-        }
+        session = await self._get_session()
+        headers = self._markets_headers()
         
         try:
-            async with self.session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    markets = data.get('markets', [])
-                    logger.info(f"Retrieved {len(markets)} soccer markets from Kalshi")
-                    
-                    # Process markets to extract relevant information
-                    processed_markets = []
-                    for market in markets:
-                        processed_markets.append({
-                            'id': market.get('id'),
-                            'ticker': market.get('ticker'),
-                            'title': market.get('title'),
-                            'subtitle': market.get('subtitle', ''),
-                            'close_time': market.get('close_time'),
-                            'yes_bid': market.get('yes_bid'),
-                            'yes_ask': market.get('yes_ask'),
-                            'no_bid': market.get('no_bid'),
-                            'no_ask': market.get('no_ask'),
-                            'last_price': market.get('last_price'),
-                            'volume': market.get('volume')
-                        })
-                    
-                    return processed_markets
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Failed to retrieve markets: {response.status} - {error_text}")
-                    return []
+            # Each page's cursor is only known once the previous page is read,
+            # so pages are followed one after another
+            markets = []
+            cursor = None
+            while True:
+                page_params = dict(self._markets_params, cursor=cursor) if cursor else self._markets_params
+                page_info = {}
+                markets.extend(await fetch_payload(
+                    session, self._markets_url,
+                    breaker=self.breaker,
+                    decode=lambda response: self._decode_markets(response, page_info),
+                    headers=headers,
+                    params=page_params
+                ))
+                
+                next_cursor = page_info.get('cursor')
+                if not next_cursor or next_cursor == cursor:
+                    break
+                cursor = next_cursor
+            
+            logger.info("Retrieved %d soccer markets from Kalshi", len(markets))
+            
+            # The schema already selects the fields we use; hand plain dicts
+            # downstream, converting the whole list in one call
+            return msgspec.to_builtins(markets)
+        except CircuitOpenError:
+            logger.warning("Kalshi circuit is open; skipping markets request")
+            return []
+        except aiohttp.ClientResponseError as e:
+            logger.error("Failed to retrieve markets: %s - %s", e.status, e.message)
+            return []
         except Exception as e:
-            logger.error(f"Error fetching Kalshi markets: {str(e)}")
+            logger.error("Error fetching Kalshi markets: %s", e)
             return []
     
+    @staticmethod
+    async def _decode_markets(response, page_info):
+        """
+        Decode the markets of one listing page.
+        
+        JSON bodies are streamed so large listings are never held whole in
+        memory; MessagePack bodies are decoded in one pass.
+        
+        Args:
+            response (aiohttp.ClientResponse): Markets listing response
+            page_info (dict): Receives the page's top-level fields, e.g. 'cursor'
+            
+        Returns:
+            list: KalshiMarket structs
+        """
+        if response.content_type in MSGPACK_CONTENT_TYPES:
+            page = msgspec.msgpack.decode(await response.read(), type=KalshiMarketsResponse)
+            page_info['cursor'] = page.cursor
+            return page.markets
+        return [msgspec.convert(item, KalshiMarket) async for item in iter_json_items(response, 'markets.item', page_info)]
+    
     async def close(self):
-        """Close the HTTP session."""
-        if self.session:
+        """Close the HTTP session if this client created it."""
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
\ No newline at end of file
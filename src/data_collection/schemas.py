@@ -0,0 +1,57 @@
+"""
+Typed response schemas for the upstream APIs.
+Decoding straight into these structs lets msgspec parse the payload and
+select the fields we use in a single pass; unknown fields are skipped.
+"""
+
+import msgspec
+from typing import List, Optional, Union
+
+class KalshiMarket(msgspec.Struct):
+    """A Kalshi market as returned by the markets endpoint."""
+    id: Optional[str] = None
+    ticker: Optional[str] = None
+    title: Optional[str] = None
+    subtitle: str = ''
+    close_time: Optional[str] = None
+    yes_bid: Optional[Union[int, float]] = None
+    yes_ask: Optional[Union[int, float]] = None
+    no_bid: Optional[Union[int, float]] = None
+    no_ask: Optional[Union[int, float]] = None
+    last_price: Optional[Union[int, float]] = None
+    volume: Optional[Union[int, float]] = None
+
+class KalshiMarketsResponse(msgspec.Struct):
+    """Body of a Kalshi markets listing page."""
+    markets: List[KalshiMarket] = []
+    cursor: Optional[str] = None
+
+class Named(msgspec.Struct):
+    """A team or competition reference."""
+    name: Optional[str] = None
+
+class Outcome(msgspec.Struct):
+    """One side of a SportsGameOdds market."""
+    name: Optional[str] = None
+    handicap: Optional[Union[float, str]] = None
+    price: Optional[Union[int, float, str]] = None
+
+class Market(msgspec.Struct):
+    """A SportsGameOdds market with its outcomes."""
+    marketType: Optional[str] = None
+    outcomes: List[Outcome] = []
+
+class Event(msgspec.Struct):
+    """A SportsGameOdds event."""
+    id: Optional[Union[str, int]] = None
+    homeTeam: Named = msgspec.field(default_factory=Named)
+    awayTeam: Named = msgspec.field(default_factory=Named)
+    startTime: Optional[str] = None
+    competition: Named = msgspec.field(default_factory=Named)
+    markets: List[Market] = []
+
+class EventsResponse(msgspec.Struct):
+    """Body of a SportsGameOdds events listing page."""
+    success: bool = False
+    data: List[Event] = []
+    nextCursor: Optional[str] = None
\ No newline at end of file
@@ -3,17 +3,68 @@ Sportsbook API client for fetching odds data.
 This is a generic client that can be configured for different sportsbooks.
 """
 
-import aiohttp
 import asyncio
 from datetime import datetime, timedelta
+from src.data_collection.http import create_session
+from src.utils.dates import upcoming_days
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Mock matches served until real API integration is implemented, built once at
+# import; each entry pairs how many days ahead the match starts with its data
+MOCK_SOCCER_MATCHES = (
+    (2, {
+        'id': 'match_1',
+        'home_team': 'Arsenal',
+        'away_team': 'Chelsea',
+        'competition': 'Premier League',
+        'markets': [
+            {
+                'type': 'spread',
+                'home_spread': -0.5,
+                'home_odds': -110,  # American odds format
+                'away_spread': 0.5,
+                'away_odds': -110
+            }
+        ]
+    }),
+    (3, {
+        'id': 'match_2',
+        'home_team': 'Barcelona',
+        'away_team': 'Real Madrid',
+        'competition': 'La Liga',
+        'markets': [
+            {
+                'type': 'spread',
+                'home_spread': -1.0,
+                'home_odds': -115,
+                'away_spread': 1.0,
+                'away_odds': -105
+            }
+        ]
+    }),
+    (1, {
+        'id': 'match_3',
+        'home_team': 'Bayern Munich',
+        'away_team': 'Borussia Dortmund',
+        'competition': 'Bundesliga',
+        'markets': [
+            {
+                'type': 'spread',
+                'home_spread': -1.5,
+                'home_odds': -105,
+                'away_spread': 1.5,
+                'away_odds': -115
+            }
+        ]
+    })
+)
+
 class SportsBookClient:
     """Client for interacting with sportsbook APIs."""
     
-    def __init__(self, name, base_url, api_key):
+    def __init__(self, name, base_url, api_key, session=None):
         """
         Initialize a sportsbook API client.
         
@@ -21,16 +72,20 @@ class SportsBookClient:
             name (str): Name of the sportsbook
             base_url (str): Base URL for the sportsbook API
             api_key (str): API key for authentication
+            session (aiohttp.ClientSession, optional): Shared HTTP session; if not
+                given, the client creates and closes its own
         """
         self.name = name
         self.base_url = base_url
         self.api_key = api_key
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
     
     async def _get_session(self):
-        """Get or create an HTTP session."""
+        """Get the shared HTTP session or create one owned by this client."""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            # A standalone client only talks to one host, so a small pool suffices
+            self.session = create_session(limit=20, keepalive_timeout=30)
         return self.session
     
     async def get_soccer_matches(self):
@@ -50,12 +105,11 @@ class SportsBookClient:
         headers = {"X-API-Key": self.api_key}
         
         # Get matches for the next 7 days
-        today = datetime.now()
-        next_week = today + timedelta(days=7)
+        day_strings = upcoming_days(7)
         
         params = {
-            "from_date": today.strftime("%Y-%m-%d"),
-            "to_date": next_week.strftime("%Y-%m-%d"),
+            "from_date": day_strings[0],
+            "to_date": day_strings[-1],
             "market": "spread"  # Focusing on spread bets
         }
         
@@ -69,15 +123,15 @@ class SportsBookClient:
             #         return self._process_matches(data)
             #     else:
             #         error_text = await response.text()
-            #         logger.error(f"Error fetching from {self.name}: {response.status} - {error_text}")
+            #         logger.error("Error fetching from %s: %s - %s", self.name, response.status, error_text)
             #         return []
             
             # Mock data for development purposes
-            logger.info(f"Would fetch soccer matches from {self.name} at {url}")
+            logger.info("Would fetch soccer matches from %s at %s", self.name, url)
             return self._mock_soccer_data()
             
         except Exception as e:
-            logger.error(f"Error fetching matches from {self.name}: {str(e)}")
+            logger.error("Error fetching matches from %s: %s", self.name, e)
             return []
     
     def _process_matches(self, data):
@@ -127,59 +181,14 @@ class SportsBookClient:
             list: Mock soccer match data
         """
         # This is used for development until real API integration is implemented
+        now = datetime.now()
         return [
-            {
-                'id': 'match_1',
-                'home_team': 'Arsenal',
-                'away_team': 'Chelsea',
-                'start_time': (datetime.now() + timedelta(days=2)).isoformat(),
-                'competition': 'Premier League',
-                'markets': [
-                    {
-                        'type': 'spread',
-                        'home_spread': -0.5,
-                        'home_odds': -110,  # American odds format
-                        'away_spread': 0.5,
-                        'away_odds': -110
-                    }
-                ]
-            },
-            {
-                'id': 'match_2',
-                'home_team': 'Barcelona',
-                'away_team': 'Real Madrid',
-                'start_time': (datetime.now() + timedelta(days=3)).isoformat(),
-                'competition': 'La Liga',
-                'markets': [
-                    {
-                        'type': 'spread',
-                        'home_spread': -1.0,
-                        'home_odds': -115,
-                        'away_spread': 1.0,
-                        'away_odds': -105
-                    }
-                ]
-            },
-            {
-                'id': 'match_3',
-                'home_team': 'Bayern Munich',
-                'away_team': 'Borussia Dortmund',
-                'start_time': (datetime.now() + timedelta(days=1)).isoformat(),
-                'competition': 'Bundesliga',
-                'markets': [
-                    {
-                        'type': 'spread',
-                        'home_spread': -1.5,
-                        'home_odds': -105,
-                        'away_spread': 1.5,
-                        'away_odds': -115
-                    }
-                ]
-            }
+            {**match, 'start_time': (now + timedelta(days=days_ahead)).isoformat()}
+            for days_ahead, match in MOCK_SOCCER_MATCHES
         ]
     
     async def close(self):
-        """Close the HTTP session."""
-        if self.session:
+        """Close the HTTP session if this client created it."""
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
\ No newline at end of file
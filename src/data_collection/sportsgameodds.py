@@ -4,31 +4,58 @@ This module handles the specific structure of the SportsGameOdds API.
 """
 
 import aiohttp
-import asyncio
-from datetime import datetime, timedelta
+import msgspec
+from src.data_collection.http import ACCEPT_MSGPACK, CircuitBreaker, CircuitOpenError, create_session, fetch_payload
+from src.data_collection.schemas import EventsResponse
+from src.analysis.odds_converter import OddsConverter
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+def _american_from_string(price):
+    """Parse American odds given as a string, e.g. '-110' or '+150'."""
+    if price.startswith('-'):
+        return int(price)
+    if price.startswith('+'):
+        return int(price[1:])
+    return 0
+
 class SportsGameOddsClient:
     """Client for interacting with the SportsGameOdds API."""
     
-    def __init__(self, base_url, api_key):
+    def __init__(self, base_url, api_key, session=None):
         """
         Initialize the SportsGameOdds API client.
         
         Args:
             base_url (str): Base URL for the SportsGameOdds API
             api_key (str): API key for authentication
+            session (aiohttp.ClientSession, optional): Shared HTTP session; if not
+                given, the client creates and closes its own
         """
         self.base_url = base_url
         self.api_key = api_key
-        self.session = None
+        self.session = session
+        self._owns_session = session is None
+        self.breaker = CircuitBreaker()
+        
+        # Request pieces that do not change between calls
+        self._events_url = f"{base_url}/events"
+        self._headers = {"X-API-Key": api_key, "Accept": ACCEPT_MSGPACK}
+        
+        # Parameters for retrieving soccer matches with odds
+        self._events_params = {
+            "sportId": "SOCCER",  # Using sport ID
+            "status": "UPCOMING",
+            "includeMarkets": "true",
+            "marketTypes": "SPREAD"  # Focus on spread bets
+        }
     
     async def _get_session(self):
-        """Get or create an HTTP session."""
+        """Get the shared HTTP session or create one owned by this client."""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            # A standalone client only talks to one host, so a small pool suffices
+            self.session = create_session(limit=20, keepalive_timeout=30)
         return self.session
     
     async def get_soccer_matches(self):
@@ -40,100 +67,126 @@ class SportsGameOddsClient:
         """
         session = await self._get_session()
         
-        # Endpoints for the SportsGameOdds API
-        events_endpoint = "/events"
+        try:
+            events = await self._fetch_events(session)
+        except msgspec.ValidationError as e:
+            logger.error("Unexpected API response structure: %s", e)
+            return []
+        except CircuitOpenError:
+            logger.warning("SportsGameOdds circuit is open; skipping request")
+            return []
+        except aiohttp.ClientResponseError as e:
+            logger.error("Error fetching from SportsGameOdds: %s - %s", e.status, e.message)
+            return []
+        except Exception as e:
+            logger.error("Error fetching matches from SportsGameOdds: %s", e)
+            return []
         
-        headers = {"X-API-Key": self.api_key}
+        processed_matches = self._process_matches(events)
+        logger.info("Retrieved %d soccer matches from SportsGameOdds API", len(processed_matches))
+        return processed_matches
+    
+    async def _fetch_events(self, session):
+        """
+        Fetch every page of upcoming soccer events using the cursor.
         
-        # Parameters for retrieving soccer matches with odds
-        params = {
-            "sportId": "SOCCER",  # Using sport ID
-            "status": "UPCOMING",
-            "includeMarkets": "true",
-            "marketTypes": "SPREAD"  # Focus on spread bets
-        }
+        Args:
+            session (aiohttp.ClientSession): Session to send requests with
+            
+        Returns:
+            list: Event structs from all pages
+        """
+        events = []
+        cursor = None
         
-        events_url = f"{self.base_url}{events_endpoint}"
+        # Each page's cursor is only known once the previous page is read,
+        # so pages are followed one after another
+        while True:
+            params = dict(self._events_params, cursor=cursor) if cursor else self._events_params
+            data = await fetch_payload(session, self._events_url, breaker=self.breaker, schema=EventsResponse, headers=self._headers, params=params)
+            
+            # Check if the response reports success
+            if not data.success:
+                raise ValueError(f"Unexpected API response structure: {data}")
+            events.extend(data.data)
+            
+            if not data.nextCursor or data.nextCursor == cursor:
+                break
+            cursor = data.nextCursor
         
-        try:
-            async with session.get(events_url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Check if the response has the expected structure
-                    if 'data' in data and isinstance(data['data'], list) and data.get('success', False):
-                        processed_matches = self._process_matches(data['data'])
-                        logger.info(f"Retrieved {len(processed_matches)} soccer matches from SportsGameOdds API")
-                        return processed_matches
-                    else:
-                        logger.error(f"Unexpected API response structure: {data}")
-                        return []
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Error fetching from SportsGameOdds: {response.status} - {error_text}")
-                    return []
-        except Exception as e:
-            logger.error(f"Error fetching matches from SportsGameOdds: {str(e)}")
-            return []
+        return events
     
     def _process_matches(self, events):
         """
-        Process raw API response into standardized match data.
+        Process decoded API events into standardized match data.
         
         Args:
-            events (list): Raw API response data list
+            events (list): Decoded Event structs from the API response
             
         Returns:
             list: Processed match data
         """
         matches = []
         
+        # Decimal prices and the (market, key) slots their American odds go into
+        decimal_prices = []
+        decimal_slots = []
+        
         for event in events:
             # Extract basic match information
             match = {
-                'id': event.get('id'),
-                'home_team': event.get('homeTeam', {}).get('name'),
-                'away_team': event.get('awayTeam', {}).get('name'),
-                'start_time': event.get('startTime'),
-                'competition': event.get('competition', {}).get('name'),
+                'id': event.id,
+                'home_team': event.homeTeam.name,
+                'away_team': event.awayTeam.name,
+                'start_time': event.startTime,
+                'competition': event.competition.name,
                 'markets': []
             }
             
+            # Map each team name to the keys its outcomes fill in (home last, so it
+            # wins if both names are the same, as the old if/elif did)
+            sides = {
+                match['away_team']: ('away_spread', 'away_odds'),
+                match['home_team']: ('home_spread', 'home_odds')
+            }
+            
             # Extract markets/odds - focus on spread markets
-            for market in event.get('markets', []):
-                if market.get('marketType') == 'SPREAD':
+            for market in event.markets:
+                if market.marketType == 'SPREAD':
                     spread_market = {
                         'type': 'spread'
                     }
+                    # Decimal prices awaiting conversion, by odds key; a later
+                    # outcome for the same side replaces the pending one
+                    pending_decimals = {}
                     
                     # Process outcomes to extract home and away spreads
-                    for outcome in market.get('outcomes', []):
-                        team_name = outcome.get('name')
-                        handicap = outcome.get('handicap')
-                        price = outcome.get('price')
+                    for outcome in market.outcomes:
+                        # Determine if this is home or away outcome
+                        keys = sides.get(outcome.name)
+                        if keys is None:
+                            continue
+                        spread_key, odds_key = keys
+                        handicap = outcome.handicap
+                        price = outcome.price
+                        spread_market[spread_key] = float(handicap) if handicap else 0.0
+                        pending_decimals.pop(odds_key, None)
                         
                         # Convert price format if necessary
-                        if isinstance(price, str) and price.startswith('-'):
+                        if isinstance(price, str):
                             # American odds format
-                            odds = int(price)
-                        elif isinstance(price, str) and price.startswith('+'):
-                            # American odds format with explicit plus
-                            odds = int(price[1:])
+                            spread_market[odds_key] = _american_from_string(price)
                         elif isinstance(price, (int, float)):
-                            # Decimal odds format - convert to American
-                            from src.analysis.odds_converter import OddsConverter
-                            odds = OddsConverter.decimal_to_american(float(price))
+                            # Decimal odds format - converted to American in one batch below
+                            spread_market[odds_key] = 0
+                            pending_decimals[odds_key] = price
                         else:
                             # Default case
-                            odds = 0
-                        
-                        # Determine if this is home or away outcome
-                        if team_name == match['home_team']:
-                            spread_market['home_spread'] = float(handicap) if handicap else 0.0
-                            spread_market['home_odds'] = odds
-                        elif team_name == match['away_team']:
-                            spread_market['away_spread'] = float(handicap) if handicap else 0.0
-                            spread_market['away_odds'] = odds
+                            spread_market[odds_key] = 0
+                    
+                    for odds_key, price in pending_decimals.items():
+                        decimal_slots.append((spread_market, odds_key))
+                        decimal_prices.append(price)
                     
                     # Only add market if we have both home and away odds
                     if 'home_spread' in spread_market and 'away_spread' in spread_market:
@@ -143,10 +196,15 @@ class SportsGameOddsClient:
             if match['markets']:
                 matches.append(match)
         
+        if decimal_prices:
+            american_odds = OddsConverter.decimal_to_american_array(decimal_prices)
+            for (spread_market, odds_key), odds in zip(decimal_slots, american_odds.tolist()):
+                spread_market[odds_key] = odds
+        
         return matches
     
     async def close(self):
-        """Close the HTTP session."""
-        if self.session:
+        """Close the HTTP session if this client created it."""
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
\ No newline at end of file
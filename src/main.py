@@ -6,78 +6,119 @@ Coordinates data collection, analysis, and reporting.
 
 import argparse
 import asyncio
-import yaml
+import logging
 import os
 from datetime import datetime
 
 from src.data_collection.sportsbook import SportsBookClient
 from src.data_collection.sportsgameodds import SportsGameOddsClient
 from src.data_collection.kalshi import KalshiClient
+from src.data_collection.http import create_session, deadline
 from src.analysis.comparator import OddsComparator
+from src.utils.config import load_yaml
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Run on uvloop's libuv-based event loop where it is installed (not on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Seconds all data collection requests must finish in unless apis.deadline_seconds is set
+DEFAULT_DEADLINE_SECONDS = 60
+
+# Sportsbooks fetched at once unless apis.max_concurrent_sportsbooks is set
+DEFAULT_MAX_CONCURRENT_SPORTSBOOKS = 8
+
 def load_config(config_path="config.yaml"):
     """Load configuration from YAML file."""
     if not os.path.exists(config_path):
-        logger.error(f"Config file not found: {config_path}")
+        logger.error("Config file not found: %s", config_path)
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with open(config_path, 'r') as file:
-        config = yaml.safe_load(file)
-    
-    return config
+    return load_yaml(config_path)
 
 async def collect_data(config):
     """Collect data from sportsbooks and Kalshi."""
     logger.info("Starting data collection...")
     
-    # Initialize clients
-    kalshi_client = KalshiClient(
-        base_url=config['apis']['kalshi']['base_url'],
-        email=config['apis']['kalshi']['email'],
-        password=config['apis']['kalshi']['password']
-    )
-    
-    sportsbook_clients = []
-    for sb_config in config['apis']['sportsbooks']:
-        # Create the appropriate client based on the sportsbook name
-        if sb_config['name'].lower() == 'sportsgameodds':
-            sportsbook_clients.append(
-                SportsGameOddsClient(
-                    base_url=sb_config['base_url'],
-                    api_key=sb_config['api_key']
-                )
+    # Connection pool sizing from the optional http section of config.yaml
+    http_config = config.get('http', {})
+    pool_settings = {
+        'limit': http_config.get('pool_size', 100),
+        'limit_per_host': http_config.get('per_host', 30),
+        'ttl_dns_cache': http_config.get('dns_cache_ttl', 300)
+    }
+    logger.info("HTTP pool: %(limit)d connections, %(limit_per_host)d per host, DNS cached for %(ttl_dns_cache)ds",
+                pool_settings)
+    
+    # Every request must finish within the collection deadline
+    with deadline(config['apis'].get('deadline_seconds', DEFAULT_DEADLINE_SECONDS)):
+        # All clients share one pooled session so connections are reused across APIs
+        async with create_session(**pool_settings) as session:
+            # Initialize clients
+            kalshi_client = KalshiClient(
+                base_url=config['apis']['kalshi']['base_url'],
+                email=config['apis']['kalshi']['email'],
+                password=config['apis']['kalshi']['password'],
+                session=session
             )
-        else:
-            sportsbook_clients.append(
-                SportsBookClient(
-                    name=sb_config['name'],
-                    base_url=sb_config['base_url'],
-                    api_key=sb_config['api_key']
-                )
+            
+            sportsbook_clients = []
+            for sb_config in config['apis']['sportsbooks']:
+                # Create the appropriate client based on the sportsbook name
+                if sb_config['name'].lower() == 'sportsgameodds':
+                    sportsbook_clients.append(
+                        SportsGameOddsClient(
+                            base_url=sb_config['base_url'],
+                            api_key=sb_config['api_key'],
+                            session=session
+                        )
+                    )
+                else:
+                    sportsbook_clients.append(
+                        SportsBookClient(
+                            name=sb_config['name'],
+                            base_url=sb_config['base_url'],
+                            api_key=sb_config['api_key'],
+                            session=session
+                        )
+                    )
+            
+            # Bulkhead: cap how many sportsbooks are fetched at once; the rest wait their turn
+            semaphore = asyncio.Semaphore(
+                config['apis'].get('max_concurrent_sportsbooks', DEFAULT_MAX_CONCURRENT_SPORTSBOOKS)
             )
+            
+            async def fetch_bounded(client):
+                async with semaphore:
+                    return await client.get_soccer_matches()
+            
+            # Fetch Kalshi markets and all sportsbook matches concurrently; the Kalshi
+            # login happens inside get_soccer_markets, so it overlaps the sportsbook calls
+            results = await asyncio.gather(
+                kalshi_client.get_soccer_markets(),
+                *[fetch_bounded(client) for client in sportsbook_clients],
+                return_exceptions=True
+            )
+        
+    kalshi_markets = results[0]
+    if isinstance(kalshi_markets, Exception):
+        logger.error("Failed to fetch Kalshi markets: %s", kalshi_markets)
+        kalshi_markets = []
     
-    # Authenticate with Kalshi
-    await kalshi_client.authenticate()
-    
-    # Get soccer matches from sportsbooks
     sportsbook_data = {}
-    for client in sportsbook_clients:
+    for client, matches in zip(sportsbook_clients, results[1:]):
         client_name = getattr(client, 'name', client.__class__.__name__)
-        sportsbook_data[client_name] = await client.get_soccer_matches()
-    
-    # Get Kalshi markets
-    kalshi_markets = await kalshi_client.get_soccer_markets()
+        if isinstance(matches, Exception):
+            logger.error("Failed to fetch matches from %s: %s", client_name, matches)
+            matches = []
+        sportsbook_data[client_name] = matches
     
-    logger.info(f"Data collection complete. Found {len(kalshi_markets)} Kalshi markets and " 
-                f"{sum(len(matches) for matches in sportsbook_data.values())} sportsbook matches.")
-    
-    # Close all client sessions
-    await kalshi_client.close()
-    for client in sportsbook_clients:
-        await client.close()
+    logger.info("Data collection complete. Found %d Kalshi markets and %d sportsbook matches.",
+                len(kalshi_markets), sum(len(matches) for matches in sportsbook_data.values()))
     
     return {
         'sportsbook_data': sportsbook_data,
@@ -94,7 +135,7 @@ async def analyze_data(data, config):
         kalshi_markets=data['kalshi_markets']
     )
     
-    logger.info(f"Analysis complete. Found {len(opportunities)} potential opportunities.")
+    logger.info("Analysis complete. Found %d potential opportunities.", len(opportunities))
     
     return opportunities
 
@@ -104,14 +145,23 @@ def report_results(opportunities):
         logger.info("No significant opportunities found.")
         return
     
-    logger.info(f"Found {len(opportunities)} potential opportunities:")
+    logger.info("Found %d potential opportunities:", len(opportunities))
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    # One log record per opportunity rather than one per line
     for i, opp in enumerate(opportunities, 1):
-        logger.info(f"Opportunity #{i}:")
-        logger.info(f"  Match: {opp['match_name']}")
-        logger.info(f"  Sportsbook: {opp['sportsbook']} ({opp['sportsbook_odds']}, {opp['sportsbook_implied_prob']}%)")
-        logger.info(f"  Kalshi: {opp['kalshi_contract']} ({opp['kalshi_price']}, {opp['kalshi_implied_prob']}%)")
-        logger.info(f"  Edge: {opp['edge_percentage']:.2f}%")
-        logger.info("")
+        logger.info(
+            "Opportunity #%d:\n"
+            "  Match: %s\n"
+            "  Sportsbook: %s (%s, %s%%)\n"
+            "  Kalshi: %s (%s, %s%%)\n"
+            "  Edge: %.2f%%",
+            i, opp['match_name'],
+            opp['sportsbook'], opp['sportsbook_odds'], opp['sportsbook_implied_prob'],
+            opp['kalshi_contract'], opp['kalshi_price'], opp['kalshi_implied_prob'],
+            opp['edge_percentage']
+        )
 
 async def main(config_path):
     """Main application flow."""
@@ -119,7 +169,7 @@ async def main(config_path):
     config = load_config(config_path)
     
     # Set up logging based on config
-    logger.info(f"Starting Kalshi Odds Comparison at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("Starting Kalshi Odds Comparison at %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
     
     try:
         # Collect data from APIs
@@ -132,7 +182,7 @@ async def main(config_path):
         report_results(opportunities)
         
     except Exception as e:
-        logger.error(f"An error occurred: {str(e)}")
+        logger.error("An error occurred: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -140,4 +190,7 @@ if __name__ == "__main__":
     parser.add_argument("--config", default="config.yaml", help="Path to configuration file")
     args = parser.parse_args()
     
-    asyncio.run(main(args.config))
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main(args.config))
+    else:
+        asyncio.run(main(args.config))
\ No newline at end of file
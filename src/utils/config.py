@@ -0,0 +1,36 @@
+"""
+YAML config loading shared by the application and the scripts.
+Parsed files are cached on their modification time, so an edited file is
+picked up again while repeat loads of an unchanged one skip the parse.
+"""
+
+import os
+import yaml
+from functools import lru_cache
+
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+@lru_cache(maxsize=8)
+def _parse_yaml(path, mtime):
+    """Parse a YAML file; mtime is only part of the cache key."""
+    with open(path, 'r') as file:
+        return yaml.load(file, Loader=YamlLoader)
+
+def load_yaml(path):
+    """
+    Load a YAML file, re-parsing it only when it changes.
+    
+    Args:
+        path (str): Path of the YAML file
+        
+    Returns:
+        The parsed document
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    return _parse_yaml(path, os.path.getmtime(path))
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Date helpers for building API query windows.
+Formatted day strings are cached per calendar day, so repeated requests
+(retries, pages, windows) reuse them instead of reformatting.
+"""
+
+from datetime import date, timedelta
+from functools import lru_cache
+
+@lru_cache(maxsize=8)
+def _day_strings(today, days):
+    """
+    Format today and the following days as YYYY-MM-DD.
+    
+    Args:
+        today (date): First day
+        days (int): Number of days after today to include
+        
+    Returns:
+        tuple: days + 1 date strings, starting with today
+    """
+    return tuple((today + timedelta(days=offset)).isoformat() for offset in range(days + 1))
+
+def upcoming_days(days):
+    """
+    Get today's date and the next days as YYYY-MM-DD strings.
+    
+    The cache is keyed on the current date, so it rolls over at midnight.
+    
+    Args:
+        days (int): Number of days after today to include
+        
+    Returns:
+        tuple: days + 1 date strings, starting with today
+    """
+    return _day_strings(date.today(), days)
\ No newline at end of file
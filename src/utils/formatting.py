@@ -0,0 +1,41 @@
+"""
+Helpers for printing API payloads while inspecting responses.
+"""
+
+import orjson
+
+def limit_depth(obj, depth):
+    """
+    Replace containers nested deeper than depth with a '...' placeholder.
+    
+    Args:
+        obj: Decoded JSON value
+        depth (int): Number of container levels to keep
+        
+    Returns:
+        The value with deeper containers replaced by '{...}' or '[...]'
+    """
+    if isinstance(obj, dict):
+        if depth <= 0:
+            return "{...}"
+        return {k: limit_depth(v, depth - 1) for k, v in obj.items()}
+    if isinstance(obj, list):
+        if depth <= 0:
+            return "[...]"
+        return [limit_depth(v, depth - 1) for v in obj]
+    return obj
+
+def format_json(obj, depth=None):
+    """
+    Format an object as indented JSON, optionally limited to a nesting depth.
+    
+    Args:
+        obj: Decoded JSON value
+        depth (int, optional): Number of container levels to show
+        
+    Returns:
+        str: Indented JSON text
+    """
+    if depth is not None:
+        obj = limit_depth(obj, depth)
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
\ No newline at end of file
@@ -5,13 +5,18 @@ This module sets up loggers with appropriate handlers and formatters.
 
 import os
 import logging
-import yaml
 from datetime import datetime
+from functools import lru_cache
+from src.utils.config import load_yaml
 
+@lru_cache(maxsize=None)
 def setup_logger(config_path="config.yaml"):
     """
     Set up and configure a logger instance.
     
+    The logger is configured once per config path; later calls (e.g. from
+    each module at import time) return it without re-reading the config.
+    
     Args:
         config_path (str): Path to the configuration file
         
@@ -45,8 +50,7 @@ def setup_logger(config_path="config.yaml"):
     # Try to load config and set up file handler if specified
     if os.path.exists(config_path):
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
+            config = load_yaml(config_path)
             
             # Set log level from config
             log_level = config.get('logging', {}).get('level', 'INFO').upper()
@@ -67,10 +71,10 @@ def setup_logger(config_path="config.yaml"):
                 file_handler.setFormatter(formatter)
                 logger.addHandler(file_handler)
                 
-                logger.info(f"Logging to file: {log_file}")
+                logger.info("Logging to file: %s", log_file)
         
         except Exception as e:
-            logger.warning(f"Error loading logging configuration: {str(e)}")
+            logger.warning("Error loading logging configuration: %s", e)
             logger.warning("Using default logging configuration")
     
     return logger
\ No newline at end of file
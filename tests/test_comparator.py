@@ -3,6 +3,7 @@ Tests for the comparator module.
 """
 
 import pytest
+from unittest.mock import patch
 from src.analysis.comparator import OddsComparator
 
 class TestOddsComparator:
@@ -68,6 +69,45 @@ class TestOddsComparator:
         assert len(matching_markets) == 1
         assert matching_markets[0]['id'] == 'kalshi_market_1'
     
+    def test_find_matching_kalshi_markets_with_index(self):
+        """Test finding matching Kalshi markets through a prebuilt index."""
+        kalshi_markets = [
+            {'title': 'Team A vs Team C', 'subtitle': 'Team A -1.5'},
+            {'title': 'Team B vs Team A', 'subtitle': 'Team B +0.5'},
+            {'title': 'Team A vs Team B', 'subtitle': 'Team A -1.5'}
+        ]
+        kalshi_index = self.comparator._build_kalshi_index(kalshi_markets)
+        match = self.sportsbook_data['test_sportsbook'][0]
+        
+        matching_markets = self.comparator._find_matching_kalshi_markets(match, kalshi_markets, kalshi_index)
+        
+        # Both markets mentioning Team A and Team B match, in their original order
+        assert matching_markets == [kalshi_markets[1], kalshi_markets[2]]
+    
+    def test_find_matching_kalshi_markets_partial_word(self):
+        """Test that a team name matching only part of a word is still found."""
+        kalshi_markets = [
+            {'title': 'Internazionale vs Milan', 'subtitle': 'Home -0.5'},
+            {'title': 'Juventus vs Milan', 'subtitle': 'Juventus -0.5'}
+        ]
+        match = {'home_team': 'Inter', 'away_team': 'Milan'}
+        
+        matching_markets = self.comparator._find_matching_kalshi_markets(match, kalshi_markets)
+        
+        assert matching_markets == [kalshi_markets[0]]
+    
+    def test_find_matching_kalshi_markets_short_names(self):
+        """Test that names shorter than an index n-gram fall back to the substring check."""
+        kalshi_markets = [
+            {'title': 'A vs B', 'subtitle': ''},
+            {'title': 'C vs D', 'subtitle': ''}
+        ]
+        match = {'home_team': 'A', 'away_team': 'B'}
+        
+        matching_markets = self.comparator._find_matching_kalshi_markets(match, kalshi_markets)
+        
+        assert matching_markets == [kalshi_markets[0]]
+    
     def test_no_matching_kalshi_markets(self):
         """Test when no matching Kalshi markets are found."""
         # Modified match with different team names
@@ -85,6 +125,22 @@ class TestOddsComparator:
         # Should find no matching markets
         assert len(matching_markets) == 0
     
+    def test_find_opportunities_matches_each_game_once(self):
+        """Test that a game listed by several sportsbooks is matched only once."""
+        sportsbook_data = {
+            'sportsbook_1': self.sportsbook_data['test_sportsbook'],
+            'sportsbook_2': self.sportsbook_data['test_sportsbook']
+        }
+        
+        with patch.object(
+            self.comparator,
+            '_find_matching_positions',
+            wraps=self.comparator._find_matching_positions
+        ) as mock_find:
+            self.comparator.find_opportunities(sportsbook_data, self.kalshi_markets)
+        
+        assert mock_find.call_count == 1
+    
     def test_find_opportunities(self):
         """Test finding opportunities."""
         # This is a more comprehensive test that would require mock data
@@ -95,4 +151,69 @@ class TestOddsComparator:
         )
         
         # Basic structure check
-        assert isinstance(opportunities, list)
\ No newline at end of file
+        assert isinstance(opportunities, list)
+    
+    def test_find_opportunities_with_matching_spread(self):
+        """Test that a matching spread market with a large edge is reported."""
+        kalshi_markets = self.kalshi_markets + [
+            {
+                'id': 'kalshi_market_2',
+                'ticker': 'SOCCER-TEAMA-TEAMB-456',
+                'title': 'Team A vs Team B',
+                'subtitle': 'Team A -1.5 goals',
+                'close_time': '2023-12-01T12:00:00Z',
+                'yes_bid': 40,
+                'yes_ask': 45,
+                'no_bid': 55,
+                'no_ask': 60,
+                'last_price': 44,
+                'volume': 500
+            }
+        ]
+        
+        opportunities = self.comparator.find_opportunities(self.sportsbook_data, kalshi_markets)
+        
+        # Only the home -1.5 line matches the new market (52.38% vs 45%)
+        assert len(opportunities) == 1
+        opp = opportunities[0]
+        assert opp['kalshi_contract'] == 'SOCCER-TEAMA-TEAMB-456'
+        assert opp['sportsbook_market'] == 'Team A -1.5'
+        assert opp['sportsbook_implied_prob'] == 52.38
+        assert opp['kalshi_implied_prob'] == 45.0
+        assert opp['edge_percentage'] == 7.38
+    
+    def test_find_opportunities_ignores_missing_prices(self):
+        """Test that a spread side without a price (odds of 0) yields no opportunity."""
+        self.sportsbook_data['test_sportsbook'][0]['markets'][0]['home_odds'] = 0
+        kalshi_markets = [
+            {
+                'id': 'kalshi_market_2',
+                'ticker': 'SOCCER-TEAMA-TEAMB-456',
+                'title': 'Team A vs Team B',
+                'subtitle': 'Team A -1.5 goals',
+                'yes_ask': 50
+            }
+        ]
+        
+        opportunities = self.comparator.find_opportunities(self.sportsbook_data, kalshi_markets)
+        
+        assert opportunities == []
+    
+    def test_find_opportunities_sorted_by_edge(self):
+        """Test that opportunities are returned with the highest edge first."""
+        kalshi_markets = [
+            {
+                'id': f'kalshi_market_{price}',
+                'ticker': f'SOCCER-TEAMA-TEAMB-{price}',
+                'title': 'Team A vs Team B',
+                'subtitle': 'Team A -1.5 goals',
+                'yes_ask': price
+            }
+            for price in (40, 30, 45, 35)
+        ]
+        
+        opportunities = self.comparator.find_opportunities(self.sportsbook_data, kalshi_markets)
+        
+        edges = [opp['edge_percentage'] for opp in opportunities]
+        assert [opp['kalshi_price'] for opp in opportunities] == [30, 35, 40, 45]
+        assert edges == sorted(edges, reverse=True)
\ No newline at end of file
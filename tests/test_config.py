@@ -0,0 +1,30 @@
+"""
+Tests for the config loading helper.
+"""
+
+import os
+import pytest
+from src.utils.config import load_yaml
+
+class TestLoadYaml:
+    """Test suite for load_yaml."""
+    
+    def test_load_yaml_cached_until_modified(self, tmp_path):
+        """Test that an unchanged file is served from the cache and an edited one re-parsed."""
+        path = tmp_path / "config.yaml"
+        path.write_text("threshold: 5")
+        
+        first = load_yaml(str(path))
+        assert first == {"threshold": 5}
+        assert load_yaml(str(path)) is first
+        
+        path.write_text("threshold: 7")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        assert load_yaml(str(path)) == {"threshold": 7}
+    
+    def test_load_yaml_missing_file(self, tmp_path):
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_yaml(str(tmp_path / "missing.yaml"))
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Tests for the date helpers.
+"""
+
+from datetime import date
+from unittest.mock import patch
+from src.utils import dates
+
+class TestUpcomingDays:
+    """Test suite for upcoming_days."""
+    
+    def test_upcoming_days(self):
+        """Test that today and the following days are formatted in order."""
+        with patch.object(dates, 'date') as mock_date:
+            mock_date.today.return_value = date(2023, 12, 30)
+            assert dates.upcoming_days(3) == ('2023-12-30', '2023-12-31', '2024-01-01', '2024-01-02')
+    
+    def test_upcoming_days_rolls_over(self):
+        """Test that the cached strings follow the current date."""
+        with patch.object(dates, 'date') as mock_date:
+            mock_date.today.return_value = date(2023, 12, 1)
+            first = dates.upcoming_days(1)
+            mock_date.today.return_value = date(2023, 12, 2)
+            second = dates.upcoming_days(1)
+        
+        assert first == ('2023-12-01', '2023-12-02')
+        assert second == ('2023-12-02', '2023-12-03')
@@ -0,0 +1,21 @@
+"""
+Tests for the payload formatting helpers.
+"""
+
+from src.utils.formatting import format_json, limit_depth
+
+class TestFormatting:
+    """Test suite for limit_depth and format_json."""
+    
+    def test_limit_depth(self):
+        """Test that containers below the depth are replaced with placeholders."""
+        data = {"data": [{"id": 1}], "success": True}
+        
+        assert limit_depth(data, 1) == {"data": "[...]", "success": True}
+        assert limit_depth(data, 2) == {"data": ["{...}"], "success": True}
+        assert limit_depth(data, 3) == data
+    
+    def test_format_json(self):
+        """Test that values are formatted as indented JSON."""
+        assert format_json({"a": [1]}) == '{\n  "a": [\n    1\n  ]\n}'
+        assert format_json({"a": {"b": 1}}, depth=1) == '{\n  "a": "{...}"\n}'
\ No newline at end of file
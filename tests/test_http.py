@@ -0,0 +1,246 @@
+"""
+Tests for the shared HTTP helpers.
+"""
+
+import pytest
+import aiohttp
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
+import msgspec
+import orjson
+from src.data_collection.http import CircuitBreaker, CircuitOpenError, deadline, fetch_payload, read_payload, request_timeout
+from src.data_collection.schemas import EventsResponse
+
+class TestReadPayload:
+    """Test suite for read_payload."""
+    
+    def _response(self, content_type, body):
+        """Build a mock response with the given content type and raw body."""
+        response = MagicMock()
+        response.content_type = content_type
+        response.read = AsyncMock(return_value=body)
+        return response
+    
+    @pytest.mark.asyncio
+    async def test_msgpack_body(self):
+        """Test that MessagePack bodies are unpacked."""
+        body = msgspec.msgpack.encode({"markets": [{"id": "market_1"}]})
+        response = self._response("application/x-msgpack", body)
+        
+        data = await read_payload(response)
+        
+        assert data == {"markets": [{"id": "market_1"}]}
+    
+    @pytest.mark.asyncio
+    async def test_json_fallback(self):
+        """Test that other content types are parsed as JSON."""
+        response = self._response("application/json", b'{"format": "json"}')
+        
+        data = await read_payload(response)
+        
+        assert data == {"format": "json"}
+    
+    @pytest.mark.asyncio
+    async def test_schema_decoding(self):
+        """Test that a schema decodes the body into typed structs."""
+        body = orjson.dumps({
+            "success": True,
+            "data": [{
+                "id": "event_1",
+                "homeTeam": {"name": "Team A", "abbreviation": "TA"},
+                "markets": [{"marketType": "SPREAD", "outcomes": [{"name": "Team A", "handicap": -0.5, "price": "-110"}]}]
+            }]
+        })
+        response = self._response("application/json", body)
+        
+        data = await read_payload(response, EventsResponse)
+        
+        assert data.success is True
+        event = data.data[0]
+        assert event.homeTeam.name == "Team A"
+        assert event.awayTeam.name is None
+        assert event.markets[0].outcomes[0].price == "-110"
+
+class TestFetchPayload:
+    """Test suite for fetch_payload retries and circuit breaking."""
+    
+    def _session(self, *statuses):
+        """Build a mock session whose GETs return the given statuses in order."""
+        responses = []
+        for status in statuses:
+            response = MagicMock()
+            response.status = status
+            response.content_type = "application/json"
+            response.read = AsyncMock(return_value=orjson.dumps({"status": status}))
+            response.text = AsyncMock(return_value="error")
+            context = MagicMock()
+            context.__aenter__ = AsyncMock(return_value=response)
+            context.__aexit__ = AsyncMock(return_value=False)
+            responses.append(context)
+        session = MagicMock()
+        session.get = MagicMock(side_effect=responses)
+        return session
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.http.asyncio.sleep', new_callable=AsyncMock)
+    async def test_retries_transient_errors(self, mock_sleep):
+        """Test that 5xx responses are retried until success."""
+        session = self._session(503, 502, 200)
+        
+        data = await fetch_payload(session, "https://api.test/events")
+        
+        assert data == {"status": 200}
+        assert session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.http.asyncio.sleep', new_callable=AsyncMock)
+    async def test_does_not_retry_client_errors(self, mock_sleep):
+        """Test that non-retryable 4xx responses raise immediately."""
+        session = self._session(401, 200)
+        
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await fetch_payload(session, "https://api.test/events")
+        
+        assert exc_info.value.status == 401
+        assert session.get.call_count == 1
+        mock_sleep.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.http.asyncio.sleep', new_callable=AsyncMock)
+    async def test_open_circuit_fails_fast(self, mock_sleep):
+        """Test that an open breaker short-circuits without sending requests."""
+        breaker = CircuitBreaker(minimum_throughput=3)
+        session = self._session(503, 503, 503)
+        
+        with pytest.raises(aiohttp.ClientResponseError):
+            await fetch_payload(session, "https://api.test/events", breaker=breaker)
+        
+        assert not breaker.allow_request()
+        with pytest.raises(CircuitOpenError):
+            await fetch_payload(session, "https://api.test/events", breaker=breaker)
+        assert session.get.call_count == 3
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.http.asyncio.sleep', new_callable=AsyncMock)
+    async def test_truncated_body_is_retried(self, mock_sleep):
+        """Test that a body breaking off mid-read is retried."""
+        truncated = self._session(200).get()
+        truncated.__aenter__.return_value.read = AsyncMock(
+            side_effect=aiohttp.ClientPayloadError("Response payload is not completed")
+        )
+        session = MagicMock()
+        session.get = MagicMock(side_effect=[truncated, self._session(200).get()])
+        
+        data = await fetch_payload(session, "https://api.test/events")
+        
+        assert data == {"status": 200}
+        assert session.get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_unreported_trial_is_released(self):
+        """Test that a half-open trial ending in a non-retryable status frees the circuit for another trial."""
+        breaker = CircuitBreaker(break_duration=30, minimum_throughput=1)
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=131.0):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await fetch_payload(self._session(401), "https://api.test/events", breaker=breaker)
+            
+            assert breaker.allow_request()
+    
+    def test_circuit_half_opens_after_break(self):
+        """Test that the breaker allows a trial request after the break duration."""
+        breaker = CircuitBreaker(break_duration=30, minimum_throughput=1)
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            assert not breaker.allow_request()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=131.0):
+            assert breaker.allow_request()
+            # Only one trial request is admitted while half-open
+            assert not breaker.allow_request()
+            breaker.record_success()
+        
+        assert breaker.allow_request()
+    
+    def test_circuit_failed_trial_reopens(self):
+        """Test that a failed trial request re-opens the circuit for another break."""
+        breaker = CircuitBreaker(break_duration=30, minimum_throughput=1)
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=131.0):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=140.0):
+            assert not breaker.allow_request()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=162.0):
+            assert breaker.allow_request()
+    
+    def test_circuit_readmits_unreported_trial(self):
+        """Test that a trial request that never reports back does not wedge the circuit."""
+        breaker = CircuitBreaker(break_duration=30, minimum_throughput=1)
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=131.0):
+            assert breaker.allow_request()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=150.0):
+            assert not breaker.allow_request()
+        
+        with patch('src.data_collection.http.time.monotonic', return_value=161.0):
+            assert breaker.allow_request()
+
+class TestDeadline:
+    """Test suite for deadline propagation."""
+    
+    def test_request_timeout_capped_by_deadline(self):
+        """Test that the per-request total never exceeds the remaining deadline."""
+        assert request_timeout().total == 30
+        
+        with deadline(2):
+            timeout = request_timeout()
+        
+        assert 0 < timeout.total <= 2
+        assert timeout.connect == 5
+        assert timeout.sock_read == 15
+    
+    def test_request_timeout_after_deadline(self):
+        """Test that no request is started once the deadline has passed."""
+        with deadline(0):
+            with pytest.raises(asyncio.TimeoutError):
+                request_timeout()
+    
+    @pytest.mark.asyncio
+    async def test_deadline_propagates_to_tasks(self):
+        """Test that tasks started under a deadline inherit it."""
+        async def total():
+            return request_timeout().total
+        
+        with deadline(1):
+            totals = await asyncio.gather(total(), total())
+        
+        assert all(t <= 1 for t in totals)
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.http.asyncio.sleep', new_callable=AsyncMock)
+    async def test_no_retry_past_deadline(self, mock_sleep):
+        """Test that a retry that cannot finish before the deadline is not attempted."""
+        session = TestFetchPayload()._session(503, 200)
+        
+        with patch('src.data_collection.http.random.uniform', return_value=5.0):
+            with deadline(1):
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await fetch_payload(session, "https://api.test/events")
+        
+        assert session.get.call_count == 1
+        mock_sleep.assert_not_called()
\ No newline at end of file
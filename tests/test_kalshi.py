@@ -3,67 +3,77 @@ Tests for the Kalshi API client.
 """
 
 import pytest
+import pytest_asyncio
 import aiohttp
 import asyncio
-from unittest.mock import patch, MagicMock, AsyncMock
+import orjson
+from unittest.mock import ANY, patch, MagicMock, AsyncMock
+from src.data_collection.http import create_session
 from src.data_collection.kalshi import KalshiClient
 
+@pytest.fixture(scope="module")
+def event_loop():
+    """Run the whole module on one event loop so the shared session outlives each test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="module")
+async def shared_session():
+    """Create one pooled HTTP session reused by every test in the module."""
+    session = create_session(limit=20, keepalive_timeout=30)
+    yield session
+    await session.close()
+
+@pytest.fixture
+def client(shared_session):
+    """Create a fresh client on top of the shared session."""
+    return KalshiClient(
+        base_url="https://test-api.kalshi.com/v1",
+        email="test@example.com",
+        password="password123",
+        session=shared_session
+    )
+
 class TestKalshiClient:
     """Test suite for the KalshiClient class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.client = KalshiClient(
-            base_url="https://test-api.kalshi.com/v1",
-            email="test@example.com",
-            password="password123"
-        )
-    
-    def teardown_method(self):
-        """Clean up after tests."""
-        # Ensure any session is closed
-        if self.client.session:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.client.close())
-            else:
-                loop.run_until_complete(self.client.close())
-    
     @pytest.mark.asyncio
-    async def test_initialization(self):
+    async def test_initialization(self, client, shared_session):
         """Test client initialization."""
-        assert self.client.base_url == "https://test-api.kalshi.com/v1"
-        assert self.client.email == "test@example.com"
-        assert self.client.password == "password123"
-        assert self.client.token is None
-        assert self.client.session is None
+        assert client.base_url == "https://test-api.kalshi.com/v1"
+        assert client.email == "test@example.com"
+        assert client.password == "password123"
+        assert client.token is None
+        assert client.session is shared_session
     
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.post')
-    async def test_authenticate_success(self, mock_post):
+    async def test_authenticate_success(self, mock_post, client):
         """Test successful authentication."""
         # Mock the response
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"token": "test_token_123"})
+        mock_response.read = AsyncMock(return_value=orjson.dumps({"token": "test_token_123"}))
         mock_post.return_value.__aenter__.return_value = mock_response
         
         # Call authenticate
-        result = await self.client.authenticate()
+        result = await client.authenticate()
         
         # Check the result
         assert result is True
-        assert self.client.token == "test_token_123"
+        assert client.token == "test_token_123"
         
         # Verify the request
         mock_post.assert_called_once_with(
-            f"{self.client.base_url}/login",
-            json={"email": self.client.email, "password": self.client.password}
+            f"{client.base_url}/login",
+            json={"email": client.email, "password": client.password},
+            timeout=ANY
         )
     
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.post')
-    async def test_authenticate_failure(self, mock_post):
+    async def test_authenticate_failure(self, mock_post, client):
         """Test failed authentication."""
         # Mock the response
         mock_response = AsyncMock()
@@ -72,25 +82,26 @@ class TestKalshiClient:
         mock_post.return_value.__aenter__.return_value = mock_response
         
         # Call authenticate
-        result = await self.client.authenticate()
+        result = await client.authenticate()
         
         # Check the result
         assert result is False
-        assert self.client.token is None
+        assert client.token is None
     
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.get')
     @patch('src.data_collection.kalshi.KalshiClient.authenticate')
-    async def test_get_soccer_markets(self, mock_authenticate, mock_get):
+    async def test_get_soccer_markets(self, mock_authenticate, mock_get, client):
         """Test getting soccer markets."""
         # Mock authentication
         mock_authenticate.return_value = True
-        self.client.token = "test_token_123"
+        client.token = "test_token_123"
         
         # Mock the response
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+        mock_response.content_type = "application/json"
+        body = orjson.dumps({
             "markets": [
                 {
                     "id": "market_1",
@@ -107,10 +118,17 @@ class TestKalshiClient:
                 }
             ]
         })
+        
+        async def chunks(size):
+            # Deliver the body in two pieces to exercise streaming
+            yield body[:50]
+            yield body[50:]
+        
+        mock_response.content.iter_chunked = MagicMock(side_effect=chunks)
         mock_get.return_value.__aenter__.return_value = mock_response
         
         # Call get_soccer_markets
-        markets = await self.client.get_soccer_markets()
+        markets = await client.get_soccer_markets()
         
         # Check the result
         assert len(markets) == 1
@@ -122,17 +140,80 @@ class TestKalshiClient:
     
     @pytest.mark.asyncio
     @patch('aiohttp.ClientSession.get')
-    async def test_get_soccer_markets_not_authenticated(self, mock_get):
+    async def test_get_soccer_markets_follows_cursor(self, mock_get, client):
+        """Test that market pages are followed until the cursor runs out."""
+        client.token = "test_token_123"
+        
+        def page(body):
+            response = AsyncMock()
+            response.status = 200
+            response.content_type = "application/json"
+            
+            async def chunks(size):
+                yield orjson.dumps(body)
+            
+            response.content.iter_chunked = MagicMock(side_effect=chunks)
+            context = MagicMock()
+            context.__aenter__ = AsyncMock(return_value=response)
+            context.__aexit__ = AsyncMock(return_value=False)
+            return context
+        
+        mock_get.side_effect = [
+            page({"markets": [{"id": "market_1"}], "cursor": "page_2"}),
+            page({"markets": [{"id": "market_2"}], "cursor": ""})
+        ]
+        
+        markets = await client.get_soccer_markets()
+        
+        assert [market["id"] for market in markets] == ["market_1", "market_2"]
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[1].kwargs["params"]["cursor"] == "page_2"
+    
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_get_soccer_markets_not_authenticated(self, mock_get, client):
         """Test getting soccer markets without authentication."""
         # Set up the client without a token
-        self.client.token = None
+        client.token = None
         
         # Mock authenticate to fail
-        with patch.object(self.client, 'authenticate', return_value=False):
+        with patch.object(client, 'authenticate', return_value=False):
             # Call get_soccer_markets
-            markets = await self.client.get_soccer_markets()
+            markets = await client.get_soccer_markets()
             
             # Check the result
             assert markets == []
             # Verify no request was made
-            mock_get.assert_not_called()
\ No newline at end of file
+            mock_get.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_close_leaves_shared_session_open(self):
+        """Test that close() does not close an injected session."""
+        shared_session = MagicMock()
+        shared_session.close = AsyncMock()
+        client = KalshiClient(
+            base_url="https://test-api.kalshi.com/v1",
+            email="test@example.com",
+            password="password123",
+            session=shared_session
+        )
+        
+        assert await client._get_session() is shared_session
+        
+        await client.close()
+        
+        shared_session.close.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_ensure_ready_authenticates_once(self, client):
+        """Test that concurrent callers share a single authentication."""
+        async def authenticate():
+            await asyncio.sleep(0)
+            client.token = "test_token_123"
+            return True
+        
+        with patch.object(client, 'authenticate', side_effect=authenticate) as mock_authenticate:
+            results = await asyncio.gather(*[client._ensure_ready() for _ in range(5)])
+        
+        assert results == [True] * 5
+        assert mock_authenticate.call_count == 1
@@ -2,7 +2,9 @@
 Tests for the odds_converter module.
 """
 
+import math
 import pytest
+import warnings
 from src.analysis.odds_converter import OddsConverter
 
 class TestOddsConverter:
@@ -18,6 +20,20 @@ class TestOddsConverter:
         assert round(OddsConverter.american_to_decimal(-110), 2) == 1.91
         assert round(OddsConverter.american_to_decimal(-200), 2) == 1.50
     
+    def test_american_to_decimal_array(self):
+        """Test converting a batch of American odds to decimal."""
+        odds = [100, 250, -110, -200]
+        decimal = OddsConverter.american_to_decimal_array(odds)
+        
+        assert decimal.tolist() == [OddsConverter.american_to_decimal(o) for o in odds]
+    
+    def test_zero_american_odds_are_nan(self):
+        """Test that odds of 0 (no price) convert to NaN in both scalar and batch form."""
+        assert math.isnan(OddsConverter.american_to_decimal(0))
+        assert math.isnan(OddsConverter.american_to_probability(0))
+        assert math.isnan(OddsConverter.american_to_decimal_array([0, -110])[0])
+        assert math.isnan(OddsConverter.american_to_probability_array([0, -110])[0])
+    
     def test_decimal_to_american(self):
         """Test converting decimal odds to American."""
         # Test decimal odds >= 2.0
@@ -28,24 +44,76 @@ class TestOddsConverter:
         assert OddsConverter.decimal_to_american(1.91) == -110
         assert OddsConverter.decimal_to_american(1.5) == -200
     
+    def test_decimal_to_american_array(self):
+        """Test converting a batch of decimal odds to American."""
+        odds = [2.0, 3.5, 1.91, 1.5, 2.15]
+        american = OddsConverter.decimal_to_american_array(odds)
+        
+        assert american.tolist() == [OddsConverter.decimal_to_american(o) for o in odds]
+        assert american.tolist() == [100, 250, -110, -200, 115]
+    
+    def test_invalid_decimal_odds_have_no_price(self):
+        """Test that decimal odds of 1 or less, or not finite, convert to 0 (no price)."""
+        odds = [1.0, 0.5, float('nan'), float('inf'), 2.0]
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            american = OddsConverter.decimal_to_american_array(odds)
+        
+        assert american.tolist() == [0, 0, 0, 0, 100]
+        assert [OddsConverter.decimal_to_american(o) for o in odds] == [0, 0, 0, 0, 100]
+    
     def test_decimal_to_probability(self):
         """Test converting decimal odds to probability."""
         assert round(OddsConverter.decimal_to_probability(2.0), 2) == 50.00
         assert round(OddsConverter.decimal_to_probability(1.5), 2) == 66.67
         assert round(OddsConverter.decimal_to_probability(3.0), 2) == 33.33
     
+    def test_decimal_to_probability_array(self):
+        """Test converting a batch of decimal odds to probabilities."""
+        odds = [2.0, 1.5, 3.0]
+        probabilities = OddsConverter.decimal_to_probability_array(odds)
+        
+        assert probabilities.tolist() == pytest.approx([OddsConverter.decimal_to_probability(o) for o in odds])
+    
     def test_american_to_probability(self):
         """Test converting American odds to probability."""
         assert round(OddsConverter.american_to_probability(100), 2) == 50.00
         assert round(OddsConverter.american_to_probability(-150), 2) == 60.00
         assert round(OddsConverter.american_to_probability(200), 2) == 33.33
     
+    def test_american_to_probability_cached(self):
+        """Test that repeated conversions are served from the cache."""
+        OddsConverter.american_to_probability.cache_clear()
+        
+        first = OddsConverter.american_to_probability(-110)
+        second = OddsConverter.american_to_probability(-110)
+        
+        assert first == second
+        assert OddsConverter.american_to_probability.cache_info().hits == 1
+    
+    def test_american_to_probability_array(self):
+        """Test converting a batch of American odds to probabilities."""
+        odds = [100, -150, 200, -110]
+        probabilities = OddsConverter.american_to_probability_array(odds)
+        
+        assert len(probabilities) == len(odds)
+        for american_odds, probability in zip(odds, probabilities):
+            assert round(probability, 2) == round(OddsConverter.american_to_probability(american_odds), 2)
+    
     def test_probability_to_decimal(self):
         """Test converting probability to decimal odds."""
         assert round(OddsConverter.probability_to_decimal(50), 2) == 2.00
         assert round(OddsConverter.probability_to_decimal(25), 2) == 4.00
         assert round(OddsConverter.probability_to_decimal(75), 2) == 1.33
     
+    def test_probability_to_decimal_array(self):
+        """Test converting a batch of probabilities to decimal odds."""
+        probabilities = [50, 25, 75]
+        decimal = OddsConverter.probability_to_decimal_array(probabilities)
+        
+        assert decimal.tolist() == [OddsConverter.probability_to_decimal(p) for p in probabilities]
+    
     def test_kalshi_price_to_probability(self):
         """Test converting Kalshi price to probability."""
         assert OddsConverter.kalshi_price_to_probability(65) == 65.0
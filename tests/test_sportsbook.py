@@ -22,12 +22,8 @@ class TestSportsBookClient:
     def teardown_method(self):
         """Clean up after tests."""
         # Ensure any session is closed
-        if self.client.session:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.client.close())
-            else:
-                loop.run_until_complete(self.client.close())
+        if self.client.session and not self.client.session.closed:
+            asyncio.run(self.client.close())
     
     def test_initialization(self):
         """Test client initialization."""
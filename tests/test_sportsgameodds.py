@@ -0,0 +1,130 @@
+"""
+Tests for the SportsGameOdds API client.
+"""
+
+import pytest
+import msgspec
+from unittest.mock import patch, AsyncMock
+from src.data_collection.schemas import Event, EventsResponse
+from src.data_collection.sportsgameodds import SportsGameOddsClient
+
+class TestSportsGameOddsClient:
+    """Test suite for the SportsGameOddsClient class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.client = SportsGameOddsClient(
+            base_url="https://api.sportsgameodds.test/v1",
+            api_key="test_api_key_123"
+        )
+    
+    def _events(self, outcomes):
+        """Build decoded events holding one spread market with the given outcomes."""
+        return msgspec.convert([{
+            "id": "event_1",
+            "homeTeam": {"name": "Team A"},
+            "awayTeam": {"name": "Team B"},
+            "startTime": "2023-12-01T12:00:00Z",
+            "competition": {"name": "Test League"},
+            "markets": [{"marketType": "SPREAD", "outcomes": outcomes}]
+        }], list[Event])
+    
+    def test_process_matches(self):
+        """Test that spread outcomes are mapped to home and away sides."""
+        events = self._events([
+            {"name": "Team A", "handicap": "-1.5", "price": "+150"},
+            {"name": "Team B", "handicap": 1.5, "price": "-180"}
+        ])
+        
+        matches = self.client._process_matches(events)
+        
+        assert len(matches) == 1
+        assert matches[0]["home_team"] == "Team A"
+        assert matches[0]["competition"] == "Test League"
+        assert matches[0]["markets"] == [{
+            "type": "spread",
+            "home_spread": -1.5,
+            "home_odds": 150,
+            "away_spread": 1.5,
+            "away_odds": -180
+        }]
+    
+    def test_process_matches_decimal_prices(self):
+        """Test that decimal prices are converted to American odds."""
+        events = self._events([
+            {"name": "Team A", "handicap": -0.5, "price": 2.5},
+            {"name": "Team B", "handicap": 0.5, "price": 3}
+        ])
+        
+        market = self.client._process_matches(events)[0]["markets"][0]
+        
+        assert market["home_odds"] == 150
+        assert market["away_odds"] == 200
+    
+    def test_process_matches_invalid_decimal_price(self):
+        """Test that a decimal price of 1.0 is stored as no price (0) rather than garbage."""
+        events = self._events([
+            {"name": "Team A", "handicap": -0.5, "price": 1.0},
+            {"name": "Team B", "handicap": 0.5, "price": 3}
+        ])
+        
+        market = self.client._process_matches(events)[0]["markets"][0]
+        
+        assert market["home_odds"] == 0
+        assert market["away_odds"] == 200
+    
+    def test_process_matches_last_outcome_wins(self):
+        """Test that a later outcome for a side replaces an earlier decimal price."""
+        events = self._events([
+            {"name": "Team A", "handicap": -0.5, "price": 2.5},
+            {"name": "Team A", "handicap": -1.5, "price": "+200"},
+            {"name": "Team B", "handicap": 1.5, "price": "-250"}
+        ])
+        
+        market = self.client._process_matches(events)[0]["markets"][0]
+        
+        assert market["home_spread"] == -1.5
+        assert market["home_odds"] == 200
+    
+    def test_process_matches_skips_incomplete_markets(self):
+        """Test that matches without both sides of a spread are dropped."""
+        events = self._events([
+            {"name": "Team A", "handicap": -0.5, "price": "-110"},
+            {"name": "Draw", "handicap": 0, "price": "+250"}
+        ])
+        
+        assert self.client._process_matches(events) == []
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.sportsgameodds.fetch_payload', new_callable=AsyncMock)
+    async def test_get_soccer_matches_follows_cursor(self, mock_fetch):
+        """Test that a single query is made and its pages are followed."""
+        events = self._events([
+            {"name": "Team A", "handicap": -0.5, "price": "-110"},
+            {"name": "Team B", "handicap": 0.5, "price": "-110"}
+        ])
+        mock_fetch.side_effect = [
+            EventsResponse(success=True, data=events, nextCursor="page_2"),
+            EventsResponse(success=True, data=[])
+        ]
+        self.client.session = AsyncMock()
+        
+        matches = await self.client.get_soccer_matches()
+        
+        assert len(matches) == 1
+        assert mock_fetch.call_count == 2
+        first_params, second_params = [call.kwargs['params'] for call in mock_fetch.call_args_list]
+        assert 'cursor' not in first_params
+        assert 'startsAfter' not in first_params
+        assert second_params['cursor'] == "page_2"
+    
+    @pytest.mark.asyncio
+    @patch('src.data_collection.sportsgameodds.fetch_payload', new_callable=AsyncMock)
+    async def test_get_soccer_matches_failure(self, mock_fetch):
+        """Test that an unsuccessful response yields no matches."""
+        mock_fetch.return_value = EventsResponse(success=False)
+        self.client.session = AsyncMock()
+        
+        matches = await self.client.get_soccer_matches()
+        
+        assert matches == []
\ No newline at end of file